@@ -1,12 +1,19 @@
 """AI Modules - Core AI/ML functionality"""
+from utils.compile_cache import configure_compile_caches
+
+# Set before torch/ultralytics load so compiled artifacts persist across runs
+configure_compile_caches()
+
 from .vision_processor import VisionProcessor
 from .speech_engine import SpeechEngine
 from .llm_handler import LLMHandler
 from .neural_core import NeuralCore
+from .semantic_cache import SemanticCache
 
 __all__ = [
     "VisionProcessor",
     "SpeechEngine",
     "LLMHandler",
     "NeuralCore",
+    "SemanticCache",
 ]
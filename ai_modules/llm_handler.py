@@ -1,15 +1,35 @@
-from openai import OpenAI
-from typing import Dict, List, Any
+from openai import AsyncOpenAI
+from typing import AsyncIterator, Dict, List, Any
+import asyncio
+import io
 import json
 import torch
 from transformers import AutoModelForCausalLM, pipeline, AutoTokenizer
 import os
 from dotenv import load_dotenv
 import logging
+from .semantic_cache import SemanticCache
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+_EMPTY_SCENE_DESCRIPTION = "Here's what I can describe: I don't detect any notable objects or text in the current scene."
+
+# Try to import orjson, fallback to stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Try to import pyahocorasick, fallback to substring scan
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+    logger.debug("pyahocorasick not installed. Install with: pip install pyahocorasick")
+
 class LLMHandler:
     """Language Model Handler for intent recognition and responses"""
     
@@ -20,13 +40,21 @@ class LLMHandler:
         self.use_openai = use_openai
         self.model = None
         self.client = None
+        self.embedding_model = "text-embedding-3-small"
+        self.response_cache = None
+        
+        # Bound in-flight OpenAI requests so batched calls stay under the rate limit
+        self.max_concurrency = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+        self._request_semaphore = asyncio.Semaphore(self.max_concurrency)
         
         if use_openai:
             # Initialize OpenAI client with API key from environment
             api_key = os.getenv("OPENAI_API_KEY", "")
             if api_key:
-                self.client = OpenAI(api_key=api_key)
+                self.client = AsyncOpenAI(api_key=api_key)
                 self.model = "gpt-3.5-turbo"
+                # Paraphrased commands reuse earlier results instead of a new request
+                self.response_cache = SemanticCache(self.embedding_model)
                 logger.info("Using OpenAI for LLM")
             else:
                 logger.warning("OpenAI API key not found, falling back to local model")
@@ -48,10 +76,47 @@ class LLMHandler:
             'exit': ['goodbye', 'bye', 'exit', 'quit', 'stop', 'turn off', 'shut down', 'close'],
             'general_questions': ['what', 'how', 'why', 'when', 'where']
         }
+        self._build_keyword_matcher()
+        
+    def _build_keyword_matcher(self) -> None:
+        """Precompile intent keywords for single-pass matching"""
+        # Lower index wins, preserving the declaration order of self.intents
+        self._keywords = [
+            (keyword.lower(), priority, intent)
+            for priority, (intent, keywords) in enumerate(self.intents.items())
+            for keyword in keywords
+        ]
+        
+        self._automaton = None
+        if HAS_AHOCORASICK:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, priority, intent in self._keywords:
+                existing = self._automaton.get(keyword, None)
+                if existing is None or priority < existing[0]:
+                    self._automaton.add_word(keyword, (priority, intent))
+            self._automaton.make_automaton()
+    
+    def _match_intent(self, command: str) -> str:
+        """Match command against intent keywords"""
+        cmd = command.lower()
+        
+        if self._automaton is not None:
+            matches = [value for _, value in self._automaton.iter(cmd)]
+            if matches:
+                return min(matches)[1]
+        else:
+            for keyword, _, intent in self._keywords:
+                if keyword in cmd:
+                    return intent
         
+        return "general_questions"
     
     async def understand_intent(self, command: str, context: Dict = None) -> Dict:
-        """Understand user intent from command"""
+        """Understand user intent from command
+        
+        Results guessed after an API error or unparseable reply carry
+        "fallback": True so callers don't cache them.
+        """
         if context is None:
             context = {}
         
@@ -67,28 +132,39 @@ class LLMHandler:
                 Return JSON format: {{"action": "action_name", "parameters": {{}}}}
                 """
                 
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.1,
-                    max_tokens=100
-                )
+                async def classify():
+                    async with self._request_semaphore:
+                        return await self.client.chat.completions.create(
+                            model=self.model,
+                            messages=[{"role": "user", "content": prompt}],
+                            temperature=0.1,
+                            max_tokens=100,
+                            response_format={"type": "json_object"}
+                        )
+                
+                cached, embedding, response = await self._with_cache('intent', command, classify)
+                if cached is not None:
+                    return dict(cached)
                 
-                result = json.loads(response.choices[0].message.content)
+                result = self._parse_intent(response.choices[0].message.content)
+                if result is None:
+                    # Malformed model output: fall back to keyword matching
+                    return {
+                        "action": self._match_intent(command),
+                        "parameters": {"query": command},
+                        "fallback": True
+                    }
+                
+                # Parameters belong to this wording ("go to the bank"), so a
+                # paraphrase could not reuse them; only parameterless intents are cached
+                if not result['parameters']:
+                    self._cache_insert('intent', embedding, result)
                 return result
             
             else:
                 # Use keyword matching for local intent recognition
-                for intent, keywords in self.intents.items():
-                    for keyword in keywords:
-                        if keyword.lower() in command.lower():
-                            return {
-                                "action": intent,
-                                "parameters": {"query": command}
-                            }
-                
                 return {
-                    "action": "general_questions",
+                    "action": self._match_intent(command),
                     "parameters": {"query": command}
                 }
         
@@ -96,9 +172,101 @@ class LLMHandler:
             logger.error(f"Error understanding intent: {e}")
             return {
                 "action": "general_questions",
-                "parameters": {"query": command}
+                "parameters": {"query": command},
+                "fallback": True
             }
     
+    async def _embed(self, text: str):
+        """Embed text for the semantic response cache"""
+        if self.response_cache is None:
+            return None
+        
+        try:
+            async with self._request_semaphore:
+                response = await self.client.embeddings.create(
+                    model=self.embedding_model,
+                    input=text
+                )
+            return response.data[0].embedding
+        except Exception as e:
+            logger.debug(f"Error embedding text for cache: {e}")
+            return None
+    
+    def _cache_lookup(self, namespace: str, embedding):
+        """Return a cached result for a similar query, if any"""
+        if self.response_cache is None or embedding is None:
+            return None
+        return self.response_cache.lookup(namespace, embedding)
+    
+    def _cache_insert(self, namespace: str, embedding, value) -> None:
+        """Store a result in the semantic cache; it is written to disk by close()"""
+        if self.response_cache is None or embedding is None:
+            return
+        self.response_cache.insert(namespace, embedding, value)
+    
+    async def _with_cache(self, namespace: str, text: str, request, discard=None):
+        """Run a request concurrently with the cache lookup for text
+        
+        The embedding round trip overlaps the request instead of delaying
+        it; a cache hit cancels the request, or hands an already finished
+        result to discard().
+        
+        Returns:
+            (cached, embedding, result) with result None on a hit
+        """
+        if self.response_cache is None:
+            return None, None, await request()
+        
+        pending = asyncio.ensure_future(request())
+        try:
+            embedding = await self._embed(text)
+            cached = self._cache_lookup(namespace, embedding)
+        except BaseException:
+            pending.cancel()
+            raise
+        
+        if cached is None:
+            return None, embedding, await pending
+        
+        if not pending.done():
+            pending.cancel()
+        elif not pending.cancelled() and pending.exception() is None and discard is not None:
+            await discard(pending.result())
+        return cached, embedding, None
+    
+    async def close(self):
+        """Persist the semantic cache off the event loop"""
+        if self.response_cache is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.response_cache.save)
+    
+    def _parse_intent(self, content: str):
+        """Parse and validate the model's intent JSON, None if malformed"""
+        try:
+            result = orjson.loads(content) if HAS_ORJSON else json.loads(content)
+        except ValueError:
+            logger.warning(f"Intent response is not valid JSON: {content!r}")
+            return None
+        
+        if not isinstance(result, dict) or result.get('action') not in self.intents:
+            logger.warning(f"Intent response has unexpected shape: {content!r}")
+            return None
+        
+        parameters = result.get('parameters')
+        if not isinstance(parameters, dict):
+            parameters = {}
+        
+        return {"action": result['action'], "parameters": parameters}
+    
+    async def understand_intents(self, commands: List[str], context: Dict = None) -> List[Dict]:
+        """Understand several queued commands concurrently
+        
+        Requests overlap their network latency; the number in flight is
+        capped by OPENAI_MAX_CONCURRENCY.
+        """
+        return list(await asyncio.gather(
+            *[self.understand_intent(command, context) for command in commands]
+        ))
+    
     async def generate_response(self, query: str, context: Dict = None) -> str:
         """Generate natural language response"""
         if context is None:
@@ -106,19 +274,22 @@ class LLMHandler:
         
         try:
             if self.use_openai and self.client and self.model:
-                messages = [
-                    {"role": "system", "content": "You are a helpful assistant for visually impaired people."},
-                    {"role": "user", "content": query}
-                ]
+                async def respond():
+                    async with self._request_semaphore:
+                        return await self.client.chat.completions.create(
+                            model=self.model,
+                            messages=self._response_messages(query),
+                            temperature=0.7,
+                            max_tokens=200
+                        )
                 
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=0.7,
-                    max_tokens=200
-                )
+                cached, embedding, response = await self._with_cache('response', query, respond)
+                if cached is not None:
+                    return cached
                 
-                return response.choices[0].message.content
+                content = response.choices[0].message.content
+                self._cache_insert('response', embedding, content)
+                return content
             
             else:
                 # Local model response
@@ -128,24 +299,149 @@ class LLMHandler:
             logger.error(f"Error generating response: {e}")
             return "I encountered an error processing your request."
     
+    async def generate_response_stream(self, query: str, context: Dict = None) -> AsyncIterator[str]:
+        """Generate a response, yielding text chunks as they arrive
+        
+        Lets speech start at the first sentence instead of waiting for
+        the whole completion.
+        """
+        if not (self.use_openai and self.client and self.model):
+            yield await self.generate_response(query, context)
+            return
+        
+        chunks = []
+        try:
+            # The slot is held while the request is made, not while it streams, so
+            # an open stream never blocks the embedding it is racing against
+            async def open_stream():
+                async with self._request_semaphore:
+                    return await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=self._response_messages(query),
+                        temperature=0.7,
+                        max_tokens=200,
+                        stream=True
+                    )
+            
+            cached, embedding, stream = await self._with_cache(
+                'response', query, open_stream, discard=lambda unused: unused.close()
+            )
+            if cached is not None:
+                yield cached
+                return
+            
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+            
+            self._cache_insert('response', embedding, "".join(chunks))
+        
+        except Exception as e:
+            logger.error(f"Error streaming response: {e}")
+            if not chunks:
+                yield "I encountered an error processing your request."
+    
+    def _response_messages(self, query: str) -> List[Dict]:
+        """Build chat messages for a general response"""
+        return [
+            {"role": "system", "content": "You are a helpful assistant for visually impaired people."},
+            {"role": "user", "content": query}
+        ]
+    
+    async def generate_responses(self, queries: List[str], context: Dict = None) -> List[str]:
+        """Generate responses for several queries concurrently"""
+        return list(await asyncio.gather(
+            *[self.generate_response(query, context) for query in queries]
+        ))
+    
     async def generate_scene_description(self, objects: List = None, texts: List = None, context: Dict = None) -> str:
         """Generate scene natural description"""
-        if objects is None:
-            objects = []
-        if texts is None:
-            texts = []
-        if context is None:
-            context = {}
+        if not objects and not texts:
+            return _EMPTY_SCENE_DESCRIPTION
         
-        description = "Here's what I can describe: "
+        objects_part = f"I see {', '.join(objects)}. " if objects else ""
+        texts_part = f"I found text: {', '.join(texts)}. " if texts else ""
         
-        if objects:
-            description += f"I see {', '.join(objects)}. "
+        return f"Here's what I can describe: {objects_part}{texts_part}"
+    
+    async def generate_scene_descriptions_batch(self, items: List[Dict], mode: str = "interactive",
+                                                poll_interval: float = 30.0) -> List[str]:
+        """Generate scene descriptions for a backlog of frames
         
-        if texts:
-            description += f"I found text: {', '.join(texts)}. "
+        Args:
+            items: List of dicts with optional 'objects' and 'texts' lists
+            mode: "interactive" describes each item locally, "batch" submits a
+                single OpenAI Batch API job (cheaper, completes within 24h)
+            poll_interval: Seconds between batch status checks
         
-        if not objects and not texts:
-            description += "I don't detect any notable objects or text in the current scene."
+        Returns:
+            Descriptions in the same order as items
+        """
+        if mode == "batch" and self.use_openai and self.client and self.model:
+            try:
+                return await self._run_scene_batch(items, poll_interval)
+            except Exception as e:
+                logger.error(f"Error running scene description batch: {e}")
+        
+        return list(await asyncio.gather(
+            *[self.generate_scene_description(item.get('objects'), item.get('texts')) for item in items]
+        ))
+    
+    async def _run_scene_batch(self, items: List[Dict], poll_interval: float) -> List[str]:
+        """Submit scene descriptions as one Batch API job and wait for the output"""
+        lines = []
+        for i, item in enumerate(items):
+            objects = item.get('objects') or []
+            texts = item.get('texts') or []
+            lines.append(json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": "You describe scenes briefly for visually impaired people."},
+                        {"role": "user", "content": f"Objects: {', '.join(objects) or 'none'}. Text: {', '.join(texts) or 'none'}."}
+                    ],
+                    "temperature": 0.3,
+                    "max_tokens": 100
+                }
+            }))
+        
+        batch_file = await self.client.files.create(
+            file=("scene_descriptions.jsonl", io.BytesIO("\n".join(lines).encode("utf-8"))),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            endpoint="/v1/chat/completions",
+            input_file_id=batch_file.id,
+            completion_window="24h"
+        )
+        logger.info(f"Submitted scene description batch {batch.id} ({len(items)} requests)")
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+        
+        output = await self.client.files.content(batch.output_file_id)
+        
+        descriptions = [""] * len(items)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get('response') or {}
+            if response.get('status_code') == 200:
+                descriptions[int(record['custom_id'])] = response['body']['choices'][0]['message']['content']
+        
+        # Fill failed requests with the local description
+        for i, description in enumerate(descriptions):
+            if not description:
+                descriptions[i] = await self.generate_scene_description(items[i].get('objects'), items[i].get('texts'))
         
-        return description
\ No newline at end of file
+        return descriptions
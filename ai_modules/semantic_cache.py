@@ -0,0 +1,140 @@
+"""Semantic Cache - Reuse LLM results for paraphrased queries"""
+import json
+import logging
+from pathlib import Path
+from typing import Any, List, Optional
+
+import numpy as np
+
+from utils.similarity import quantize_int8, topk_cosine_int8
+
+logger = logging.getLogger(__name__)
+
+# Next to the other persisted data, independent of the working directory
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / "database"
+
+
+class SemanticCache:
+    """Stores (embedding, result) pairs and returns a result for similar queries"""
+
+    def __init__(self, model_name: str, threshold: float = 0.92, max_entries: int = 512,
+                 cache_dir=DEFAULT_CACHE_DIR):
+        """
+        Initialize semantic cache
+
+        Args:
+            model_name: Embedding model name, used to key the persisted cache
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Number of recent entries to keep
+            cache_dir: Directory for the persisted cache file
+        """
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.cache_file = Path(cache_dir) / f"semantic_cache_{model_name.replace('/', '_')}.npz"
+
+        # Ring buffer: (max_entries, dim) unit vectors as int8 with a scale per row,
+        # allocated on first insert; a quarter of the float32 footprint
+        self.embeddings: Optional[np.ndarray] = None
+        self.scales: Optional[np.ndarray] = None
+        self.values: List[Any] = []  # (namespace, value) per row
+        self._size = 0
+        self._next = 0  # row the next insert overwrites
+        self._dirty = False  # inserts not yet saved
+        self._load()
+
+    def _load(self) -> None:
+        """Load persisted cache entries from disk"""
+        try:
+            if self.cache_file.exists():
+                with np.load(self.cache_file, allow_pickle=False) as data:
+                    for embedding, namespace, value in zip(data['embeddings'], data['namespaces'], data['values']):
+                        self.insert(str(namespace), embedding, json.loads(str(value)))
+                self._dirty = False
+                logger.info(f"Loaded {self._size} semantic cache entries")
+        except Exception as e:
+            logger.error(f"Error loading semantic cache: {e}")
+            self.clear()
+
+    def save(self) -> None:
+        """Persist cache entries to disk, if any were added since the last save"""
+        if not self._dirty or not self._size:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Persist oldest first so reloading preserves eviction order.
+            # Plain arrays only: values are stored as JSON strings, so loading never unpickles
+            order = self._ordered_rows()
+            with open(self.cache_file, 'wb') as f:
+                np.savez(
+                    f,
+                    embeddings=self.embeddings[order] * self.scales[order, np.newaxis],
+                    namespaces=np.array([self.values[i][0] for i in order]),
+                    values=np.array([json.dumps(self.values[i][1]) for i in order])
+                )
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"Error saving semantic cache: {e}")
+
+    def _ordered_rows(self) -> np.ndarray:
+        """Row indices from oldest to newest"""
+        if self._size < self.max_entries:
+            return np.arange(self._size)
+        return np.roll(np.arange(self.max_entries), -self._next)
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def lookup(self, namespace: str, embedding) -> Optional[Any]:
+        """
+        Find a cached result for a similar query
+
+        Args:
+            namespace: Separates result kinds (e.g. 'intent', 'response')
+            embedding: Query embedding vector
+
+        Returns:
+            Cached result on a hit, None on a miss
+        """
+        if not self._size:
+            return None
+
+        # Each query is usually cached once per namespace, so a few candidates suffice
+        indices, scores = topk_cosine_int8(self.embeddings[:self._size], self.scales[:self._size],
+                                           self._normalize(embedding), k=8)
+        for idx, score in zip(indices, scores):
+            if score < self.threshold:
+                break
+            cached_namespace, value = self.values[idx]
+            if cached_namespace == namespace:
+                logger.debug(f"Semantic cache hit ({score:.3f})")
+                return value
+
+        return None
+
+    def insert(self, namespace: str, embedding, value: Any) -> None:
+        """Add a result to the cache, evicting the oldest entry when full"""
+        vector = self._normalize(embedding)
+
+        if self.embeddings is None:
+            self.embeddings = np.zeros((self.max_entries, vector.shape[0]), dtype=np.int8)
+            self.scales = np.ones(self.max_entries, dtype=np.float32)
+            self.values = [None] * self.max_entries
+
+        self.embeddings[self._next], self.scales[self._next] = quantize_int8(vector)
+        self.values[self._next] = (namespace, value)
+        self._next = (self._next + 1) % self.max_entries
+        self._size = min(self._size + 1, self.max_entries)
+        self._dirty = True
+
+    def clear(self) -> None:
+        """Remove all cached entries"""
+        self.embeddings = None
+        self.scales = None
+        self.values = []
+        self._size = 0
+        self._next = 0
+        self._dirty = False
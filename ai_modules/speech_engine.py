@@ -2,9 +2,14 @@ import speech_recognition as sr
 import pyttsx3
 import asyncio
 from gtts import gTTS
+import io
 import os
+import re
 import tempfile
-from typing import Optional, Any
+from typing import Optional, Any, AsyncIterator
+from collections import deque
+import numpy as np
+import queue
 import threading
 import yaml
 from pathlib import Path
@@ -12,6 +17,27 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Sentence boundary used to start speaking streamed text early
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+# Try to import in-process audio playback, fallback to mpg123 subprocess
+try:
+    import sounddevice
+    import soundfile
+    HAS_SOUNDDEVICE = True
+except (ImportError, OSError):
+    HAS_SOUNDDEVICE = False
+    logger.debug("sounddevice/soundfile not installed. Install with: pip install sounddevice soundfile")
+
+# Try to import local speech recognition, fallback to Google Web Speech API
+try:
+    from faster_whisper import WhisperModel
+    import ctranslate2
+    HAS_FASTER_WHISPER = True
+except ImportError:
+    HAS_FASTER_WHISPER = False
+    logger.debug("faster-whisper not installed. Install with: pip install faster-whisper")
+
 class SpeechEngine:
     def __init__(self, language="en", config_path="config.yaml"):
         print("Initializing Speech Engine...")
@@ -23,22 +49,69 @@ class SpeechEngine:
         self.language = language
         self.speech_rate = self.config.get('speech', {}).get('speech_rate', 150)
         self.use_google_tts = self.config.get('speech', {}).get('use_google_tts', False)
+        self.stt_engine = self.config.get('speech', {}).get('stt_engine', 'whisper')
+        self.whisper_model_name = self.config.get('speech', {}).get('whisper_model', 'small')
         
         # Load language configurations
         self.language_configs = self.config.get('speech', {}).get('languages', {})
         self.current_lang_config = self.language_configs.get(language, {})
         
-        # Initialize TTS engine
-        self.tts_engine = pyttsx3.init()
-        self.setup_tts()
+        # Playback runs on a dedicated worker so speak() never blocks the caller.
+        # The pyttsx3 engine is created on that thread and only used there: SAPI5 (COM)
+        # and NSSpeechSynthesizer don't allow driving it from another thread
+        self.tts_engine = None
+        self._tts_queue = queue.Queue()
+        self._is_speaking = threading.Event()
+        self._audio_buffer = io.BytesIO()  # reused by the worker for every gTTS utterance
+        tts_ready = queue.Queue(maxsize=1)
+        self._tts_thread = threading.Thread(target=self._tts_loop, args=(tts_ready,),
+                                            name="tts-worker", daemon=True)
+        self._tts_thread.start()
+        
+        # Surface engine initialization errors here, as before
+        error = tts_ready.get()
+        if error is not None:
+            raise error
         
         # initialize STT recognizer
         self.recognizer = sr.Recognizer()
+        self.stt_model = self._load_stt_model()
         self.microphone = sr.Microphone()
         
-        # Adjust for ambient noise
+        # Phrases captured by the background listener; see start_listening
+        self._phrases = deque(maxlen=5)
+        self._phrase_ready = threading.Condition()
+        self._stop_background_listening = None
+    
+    def start_listening(self) -> None:
+        """Calibrate the microphone and start capturing phrases in the background
+        
+        One microphone stream stays open on a background thread and captured
+        phrases are buffered for listen(), instead of reopening the stream on
+        every call. Blocks for about a second while calibrating.
+        """
+        if self._stop_background_listening is not None:
+            return
+        
+        # Adjust for ambient noise once; the calibrated threshold is kept on the recognizer
         with self.microphone as source:
             self.recognizer.adjust_for_ambient_noise(source, duration=1)
+        
+        self._stop_background_listening = self.recognizer.listen_in_background(
+            self.microphone,
+            self._on_phrase,
+            phrase_time_limit=10
+        )
+    
+    def stop_listening(self) -> None:
+        """Stop the background listener and drop buffered phrases"""
+        if self._stop_background_listening is None:
+            return
+        
+        self._stop_background_listening(wait_for_stop=False)
+        self._stop_background_listening = None
+        with self._phrase_ready:
+            self._phrases.clear()
     
     def _load_config(self, config_path: str) -> dict:
         """Load configuration from YAML file"""
@@ -52,6 +125,48 @@ class SpeechEngine:
             print(f"Warning: Could not load config file: {e}")
             return {}
     
+    def _load_stt_model(self):
+        """Load the local Whisper model, kept resident for every utterance"""
+        if self.stt_engine != 'whisper' or not HAS_FASTER_WHISPER:
+            return None
+        
+        try:
+            if ctranslate2.get_cuda_device_count() > 0:
+                device, compute_type = "cuda", "int8_float16"
+            else:
+                device, compute_type = "cpu", "int8"
+            model = WhisperModel(self.whisper_model_name, device=device, compute_type=compute_type)
+            logger.info(f"Using local Whisper ({self.whisper_model_name}, {compute_type}) for speech recognition")
+            return model
+        except Exception as e:
+            logger.warning(f"Could not load Whisper model, using Google speech recognition: {e}")
+            return None
+    
+    def _transcribe_local(self, audio: sr.AudioData) -> Optional[str]:
+        """Transcribe captured audio with the local Whisper model"""
+        pcm = np.frombuffer(audio.get_raw_data(convert_rate=16000, convert_width=2), dtype=np.int16)
+        samples = pcm.astype(np.float32) / 32768.0
+        
+        segments, _ = self.stt_model.transcribe(
+            samples,
+            language=self.language,
+            beam_size=1,
+            vad_filter=True
+        )
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+        return text or None
+    
+    def warmup(self) -> None:
+        """Decode one second of silence so the first transcription skips lazy init (blocking)"""
+        if self.stt_model is None:
+            return
+        try:
+            # Segments are generated lazily; consume them so the decoder actually runs
+            segments, _ = self.stt_model.transcribe(np.zeros(16000, dtype=np.float32), beam_size=1)
+            list(segments)
+        except Exception as e:
+            logger.warning(f"Whisper warmup failed: {e}")
+    
     def set_language(self, language: str) -> bool:
         """Change the language dynamically"""
         if language not in self.language_configs:
@@ -78,7 +193,11 @@ class SpeechEngine:
         return self.language_configs.get(target_code, {}).get('name', target_code)
             
     def setup_tts(self) -> None:
-        """Setup TTS Engine properties"""
+        """Apply voice, rate and volume for the current language on the TTS worker"""
+        self._tts_queue.put(self._apply_tts_settings)
+    
+    def _apply_tts_settings(self) -> None:
+        """Set TTS Engine properties; runs on the TTS worker"""
         try:
             voices: Any = self.tts_engine.getProperty("voices")
             
@@ -94,29 +213,105 @@ class SpeechEngine:
         self.tts_engine.setProperty('volume', 1.0)
         
     def speak(self, text: str, use_google: Optional[bool] = None) -> None:
-        """Convert text to speech
+        """Queue text for speech and return immediately
         
         Args:
             text: Text to speak
             use_google: Override default TTS provider. None uses config default
         """
         use_google = use_google if use_google is not None else self.use_google_tts
+        self._tts_queue.put((text, use_google))
+    
+    def wait_until_done(self) -> None:
+        """Block until every queued utterance has been spoken"""
+        self._tts_queue.join()
+    
+    def _tts_loop(self, ready: queue.Queue) -> None:
+        """Worker thread: own the pyttsx3 engine and speak queued utterances in order
         
+        Queue items are (text, use_google) pairs, callables to run against
+        the engine, or None to stop.
+        """
+        try:
+            self.tts_engine = pyttsx3.init()
+            self._apply_tts_settings()
+        except Exception as e:
+            ready.put(e)
+            return
+        ready.put(None)
+        
+        while True:
+            item = self._tts_queue.get()
+            try:
+                if item is None:
+                    self.tts_engine.stop()
+                    return
+                if callable(item):
+                    item()
+                    continue
+                text, use_google = item
+                self._is_speaking.set()
+                self._speak_blocking(text, use_google)
+            except Exception as e:
+                logger.error(f"Error speaking text: {e}")
+            finally:
+                if self._tts_queue.empty():
+                    self._is_speaking.clear()
+                self._tts_queue.task_done()
+    
+    def _speak_blocking(self, text: str, use_google: bool) -> None:
+        """Convert text to speech and wait for playback to finish"""
         if use_google:
             # Use google tts for better quality (requires internet)
             gtts_lang = self.current_lang_config.get('gtts_lang', self.language)
             tts = gTTS(text=text, lang=gtts_lang, slow=False)
             
-            # Save to temp file and play
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
-                tts.save(fp.name)
-                os.system(f"mpg123 {fp.name}")
-                os.unlink(fp.name)
+            if HAS_SOUNDDEVICE:
+                # Decode and play in memory, no temp file or subprocess
+                buffer = self._audio_buffer
+                buffer.seek(0)
+                buffer.truncate()
+                tts.write_to_fp(buffer)
+                buffer.seek(0)
+                data, sample_rate = soundfile.read(buffer)
+                sounddevice.play(data, sample_rate)
+                sounddevice.wait()
+            else:
+                # Save to temp file and play
+                with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
+                    tts.save(fp.name)
+                    os.system(f"mpg123 {fp.name}")
+                    os.unlink(fp.name)
         else:
             # Use offline TTS
             self.tts_engine.say(text)
             self.tts_engine.runAndWait()
             
+    async def speak_stream(self, chunks: AsyncIterator[str], use_google: Optional[bool] = None) -> str:
+        """Speak streamed text sentence by sentence as it arrives
+        
+        Args:
+            chunks: Async iterator of text fragments (e.g. LLM stream)
+            use_google: Override default TTS provider. None uses config default
+        
+        Returns:
+            The full text that was spoken
+        """
+        buffer = ""
+        full_text = []
+        
+        async for chunk in chunks:
+            buffer += chunk
+            full_text.append(chunk)
+            *sentences, buffer = _SENTENCE_END.split(buffer)
+            for sentence in sentences:
+                self.speak(sentence, use_google)
+        
+        if buffer.strip():
+            self.speak(buffer, use_google)
+        
+        return "".join(full_text)
+    
     async def listen(self, timeout: int = 5) -> Optional[str]:
         """Listen for speech and convert to text"""
         loop = asyncio.get_event_loop()
@@ -134,52 +329,73 @@ class SpeechEngine:
             print(f"Speech recognition error: {e}")
             return None
         
+    def _on_phrase(self, recognizer: sr.Recognizer, audio: sr.AudioData) -> None:
+        """Background listener callback: buffer a captured phrase"""
+        if self._is_speaking.is_set():
+            # Drop our own voice picked up by the microphone
+            return
+        
+        with self._phrase_ready:
+            self._phrases.append(audio)
+            self._phrase_ready.notify()
+    
     def _recognize_speech(self, timeout: int) -> Optional[str]:
         """Blocking speech recognition with language support"""
-        with self.microphone as source:
-            print(f"Listening for {self.get_language_name()}...")
-            try:
-                audio = self.recognizer.listen(
-                    source,
-                    timeout=timeout,
-                    phrase_time_limit=10
-                )
-                
-                # Get recognition language from config
-                recognition_lang = self.current_lang_config.get('recognition_lang', f"{self.language}-{self.language.upper()}")
-                
-                # Recognize using Google Speech Recognition
-                try:
-                    text = self.recognizer.recognize_google(  # type: ignore
-                        audio,
-                        language=recognition_lang
-                    )
-                except AttributeError:
-                    # Fallback if recognize_google not available
-                    logger.error("recognize_google not available")
+        print(f"Listening for {self.get_language_name()}...")
+        
+        # Wait for the background listener to capture a phrase
+        with self._phrase_ready:
+            if not self._phrase_ready.wait_for(lambda: len(self._phrases) > 0, timeout=timeout):
+                return None
+            audio = self._phrases.popleft()
+        
+        try:
+            if self.stt_model is not None:
+                text = self._transcribe_local(audio)
+                if text is None:
+                    print(f"Could not understand audio in {self.get_language_name()}")
                     return None
-                
                 print(f"Recognized ({self.language}): {text}")
                 return text
             
-            except sr.WaitTimeoutError:
-                return None
-            except sr.UnknownValueError:
-                print(f"Could not understand audio in {self.get_language_name()}")
-                return None
-            except sr.RequestError as e:
-                print(f"Recognition service error: {e}")
+            # Get recognition language from config
+            recognition_lang = self.current_lang_config.get('recognition_lang', f"{self.language}-{self.language.upper()}")
+            
+            # Recognize using Google Speech Recognition
+            try:
+                text = self.recognizer.recognize_google(  # type: ignore
+                    audio,
+                    language=recognition_lang
+                )
+            except AttributeError:
+                # Fallback if recognize_google not available
+                logger.error("recognize_google not available")
                 return None
+            
+            print(f"Recognized ({self.language}): {text}")
+            return text
+        
+        except sr.UnknownValueError:
+            print(f"Could not understand audio in {self.get_language_name()}")
+            return None
+        except sr.RequestError as e:
+            print(f"Recognition service error: {e}")
+            return None
         
     def _set_voice_properties(self, rate=None, volume=None, voice_id=None):
         """Adjust voice properties"""
-        if rate:
-            self.tts_engine.setProperty('rate', rate)
-        if volume:
-            self.tts_engine.setProperty('volume', volume)
-        if voice_id:
-            self.tts_engine.setProperty('voice_id', voice_id)
+        def apply():
+            if rate:
+                self.tts_engine.setProperty('rate', rate)
+            if volume:
+                self.tts_engine.setProperty('volume', volume)
+            if voice_id:
+                self.tts_engine.setProperty('voice_id', voice_id)
+        
+        self._tts_queue.put(apply)
             
     def stop(self):
         """Stop speech engine"""
-        self.tts_engine.stop()
\ No newline at end of file
+        self.stop_listening()
+        # The worker stops the engine once it has finished what is queued
+        self._tts_queue.put(None)
\ No newline at end of file
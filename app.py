@@ -1,30 +1,89 @@
 """Vision Assistant - Main Application Entry Point"""
+from __future__ import annotations
+
 import sys
 import os
 import asyncio
+import atexit
 import logging
+import logging.handlers
+import queue
+import threading
+import time
 import yaml
+from collections import OrderedDict
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-# Configure logging
+# Configure logging; records are queued and written by a listener thread
+# so console I/O never blocks the event loop
+_log_queue = queue.Queue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format='%(message)s',  # full formatting happens on the listener's handler
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
+# Exact-match intent cache size; paraphrases are handled by the LLM's semantic cache
+INTENT_CACHE_SIZE = 512
+
+# Target period of the continuous assistant loop
+LOOP_PERIOD_SECONDS = 0.5
+
+# Most buffered phrases taken per loop pass; their intents are parsed concurrently
+MAX_QUEUED_COMMANDS = 5
+
+# Commands recognized by phrase before intent parsing: (phrases, handler method)
+KEYWORD_COMMANDS = (
+    (('change language', 'switch language', 'language to', 'speak'), '_handle_language_switch'),
+    (('enroll', 'register face', 'teach', 'learn my face', 'save face', 'remember', 'add person'),
+     '_handle_face_enrollment'),
+    (('forget', 'remove person', 'delete face', 'forget face', 'who do you know', 'list people'),
+     '_handle_face_management'),
+    (('listen', 'sound', 'audio', 'what do you hear', 'detect sounds', 'obstacle', 'check ahead', 'scan audio'),
+     '_handle_audio_assistance'),
+)
+
+# Intent actions answered by the LLM
+QUESTION_ACTIONS = ('general_question', 'general_questions')
+
+# Spoken feedback on the command dispatch path
+FEEDBACK = {
+    'describe_scene': "Analyzing your surroundings...",
+    'read_text': "Looking for text in your environment...",
+    'recognize_objects': "Identifying objects around you...",
+    'navigate': "Getting navigation information...",
+    'recognize_people': "Scanning for faces...",
+    'emergency': "Activating emergency alert...",
+    'not_understood': "I didn't quite understand that. Could you repeat?",
+    'command_error': "I encountered an error processing your request. Please try again.",
+}
+PROCESSING_TEMPLATE = "Processing your request: {}".format
+
+
+def _intent_parameters(intent: dict) -> dict:
+    """Parameters of a parsed intent; tolerates a missing or null entry"""
+    return intent.get('parameters') or {}
+
 class VisionAssistant:
     """Main Vision Assistant Application"""
     
-    def __init__(self, language: Optional[str] = None):
+    def __init__(self, language: Optional[str] = None, speedup: Optional[bool] = None):
         """Initialize Vision Assistant
         
         Args:
             language: Language code (en, id, es, fr, de, pt, ja, zh). Defaults to config.yaml
+            speedup: Compile vision models with torch.compile. Defaults to config.yaml
         """
         logger.info("Initializing Vision Assistant for Visually Impaired...")
         
@@ -48,6 +107,10 @@ class VisionAssistant:
             
             # Initialize core modules with language support
             self.vision = VisionProcessor()
+            if speedup is None:
+                speedup = self.config.get('vision', {}).get('speedup', False)
+            if speedup:
+                self.vision.jit_compile()
             self.speech = SpeechEngine(language=self.language)
             self.llm = LLMHandler()
             self.navigation = NavigationAssistant()
@@ -60,6 +123,13 @@ class VisionAssistant:
             self.is_processing = False
             self.enrollment_mode = False
             self.enrollment_person_name = None
+            self._intent_cache = OrderedDict()  # normalized command -> intent
+            self._load_intent_cache()
+            self._intent_handlers = self._build_intent_handlers()
+            
+            # Warm the models off the main thread; the first command waits for it
+            self._prewarm_done = threading.Event()
+            threading.Thread(target=self._prewarm, daemon=True).start()
             self.user_context = {
                 'language': self.language,
                 'language_name': self.speech.get_language_name()
@@ -71,7 +141,7 @@ class VisionAssistant:
             logger.info("Vision Assistant initialized successfully!")
             
         except Exception as e:
-            logger.error(f"Failed to initialize Vision Assistant: {e}")
+            logger.error("Failed to initialize Vision Assistant: %s", e)
             raise
     
     def _load_config(self) -> dict:
@@ -83,7 +153,7 @@ class VisionAssistant:
                     return yaml.safe_load(f) or {}
             return {}
         except Exception as e:
-            logger.warning(f"Could not load config: {e}")
+            logger.warning("Could not load config: %s", e)
             return {}
         
     def _setup_services(self):
@@ -100,110 +170,239 @@ class VisionAssistant:
             logger.info("Services setup complete!")
             
         except Exception as e:
-            logger.warning(f"Warning during service setup: {e}")
+            logger.warning("Warning during service setup: %s", e)
+        
+    def _prewarm(self):
+        """Run a dummy pass through the local models so the first command is not a cold start"""
+        try:
+            self.vision.warmup()
+            self.speech.warmup()
+            logger.info("Models warmed up")
+        except Exception as e:
+            logger.warning("Model warmup failed: %s", e)
+        finally:
+            self._prewarm_done.set()
         
     async def continuous_assistant(self):
         """Main assistant event loop"""
         logger.info("Starting continuous assistant mode...")
         
         try:
+            # Microphone calibration blocks for about a second
+            await asyncio.get_event_loop().run_in_executor(None, self.speech.start_listening)
+            self.is_listening = True
+            
+            next_tick = time.monotonic()
             while True:
                 try:
+                    continuous_mode = self.user_context.get('continuous_mode', False)
+                    
                     # Listen for voice command
                     command = await self.speech.listen()
                     
                     if command:
-                        logger.info(f"Command received: {command}")
-                        await self.process_command(command)
+                        # Phrases spoken while the last commands were handled are already buffered
+                        commands = [command]
+                        while len(commands) < MAX_QUEUED_COMMANDS:
+                            queued = await self.speech.listen(timeout=0)
+                            if not queued:
+                                break
+                            commands.append(queued)
+                        
+                        logger.info("Commands received: %s", commands)
+                        await self.process_commands(commands)
                     
                     # Continuous scene description if enabled
-                    if self.user_context.get('continuous_mode', False):
+                    if continuous_mode:
                         await self.describe_environment()
                     
-                    await asyncio.sleep(0.5)
+                    # Sleep only for what is left of the tick; restart the schedule if we fell behind
+                    next_tick += LOOP_PERIOD_SECONDS
+                    delay = next_tick - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    else:
+                        next_tick = time.monotonic()
                     
                 except KeyboardInterrupt:
                     logger.info("User exit detected. Shutting down...")
                     break
                 except Exception as e:
-                    logger.error(f"Error in assistant loop: {e}")
+                    logger.error("Error in assistant loop: %s", e)
         
         except Exception as e:
-            logger.error(f"Fatal error in continuous assistance: {e}")
+            logger.error("Fatal error in continuous assistance: %s", e)
+        finally:
+            self.stop()
                 
-    async def process_command(self, command: str):
-        """Process user voice commands"""
-        logger.info(f"Processing command: {command}")
+    async def process_command(self, command: str, intent: Optional[dict] = None):
+        """Process user voice commands
+        
+        Args:
+            command: Recognized command text
+            intent: Intent already parsed by process_commands, if any
+        """
+        logger.info("Processing command: %s", command)
         
         # Give immediate feedback
-        self.speech.speak(f"Processing your request: {command}")
+        self.speech.speak(PROCESSING_TEMPLATE(command))
         
         try:
-            # Check for language switching command
-            if any(phrase in command.lower() for phrase in ['change language', 'switch language', 'language to', 'speak']):
-                await self._handle_language_switch(command)
-                return
-            
-            # Check for face enrollment commands
-            if any(phrase in command.lower() for phrase in ['enroll', 'register face', 'teach', 'learn my face', 'save face', 'remember', 'add person']):
-                await self._handle_face_enrollment(command)
-                return
-            
-            # Check for face management commands
-            if any(phrase in command.lower() for phrase in ['forget', 'remove person', 'delete face', 'forget face', 'who do you know', 'list people']):
-                await self._handle_face_management(command)
-                return
-            
-            # Check for audio assistance commands
-            if any(phrase in command.lower() for phrase in ['listen', 'sound', 'audio', 'what do you hear', 'detect sounds', 'obstacle', 'check ahead', 'scan audio']):
-                await self._handle_audio_assistance(command)
+            # Language, face and audio commands are recognized by phrase
+            keyword_handler = self._keyword_handler(command)
+            if keyword_handler is not None:
+                await keyword_handler(command)
                 return
             
             # Parse intent
-            intent = await self.llm.understand_intent(command, self.user_context)
-            
-            # Give feedback on what will be done
-            if intent.get('action') == 'describe_scene':
-                self.speech.speak("Analyzing your surroundings...")
-                await self.describe_environment(detailed=True)
-            
-            elif intent.get('action') == 'read_text':
-                self.speech.speak("Looking for text in your environment...")
-                await self.read_text_around()
-            
-            elif intent.get('action') == 'recognize_objects':
-                self.speech.speak("Identifying objects around you...")
-                await self.identify_objects()
-            
-            elif intent.get('action') == 'navigate':
-                self.speech.speak("Getting navigation information...")
-                await self.assist_navigation(intent.get('parameters', {}))
-            
-            elif intent.get('action') == 'recognize_people':
-                self.speech.speak("Scanning for faces...")
-                await self.recognize_faces()
+            if intent is None:
+                intent = await self._cached_understand_intent(command)
             
-            elif intent.get('action') == 'emergency':
-                self.speech.speak("Activating emergency alert...")
-                await self.handle_emergency()
-            
-            elif intent.get('action') == 'exit':
-                await self.handle_exit()
-                raise KeyboardInterrupt("User requested exit")
-            
-            elif intent.get('action') == 'general_question':
-                response = await self.llm.generate_response(command)
-                self.speech.speak(response)
+            # Don't race the warmup thread for the models
+            if not self._prewarm_done.is_set():
+                await asyncio.get_running_loop().run_in_executor(None, self._prewarm_done.wait)
             
+            # Dispatch to the handler for this action
+            handler = self._intent_handlers.get(intent.get('action'))
+            if handler:
+                await handler(intent, command)
             else:
-                self.speech.speak("I didn't quite understand that. Could you repeat?")
+                self.speech.speak(FEEDBACK['not_understood'])
         
         except KeyboardInterrupt:
             raise
         except Exception as e:
-            logger.error(f"Error processing command: {e}")
-            self.speech.speak("I encountered an error processing your request. Please try again.")
+            logger.error("Error processing command: %s", e)
+            self.speech.speak(FEEDBACK['command_error'])
+    
+    async def process_commands(self, commands: list):
+        """Process several buffered commands in order
+        
+        Their intents are parsed concurrently up front, and when more than
+        one is a question the answers are generated concurrently too, so the
+        LLM round trips overlap instead of running one after another.
+        """
+        if len(commands) == 1:
+            await self.process_command(commands[0])
+            return
+        
+        parsed = [command for command in commands if self._keyword_handler(command) is None]
+        try:
+            intents = dict(zip(parsed, await self._cached_understand_intents(parsed)))
             
+            questions = [command for command in parsed if intents[command].get('action') in QUESTION_ACTIONS]
+            if len(questions) > 1:
+                answers = await self.llm.generate_responses(questions, self.user_context)
+                for command, answer in zip(questions, answers):
+                    intents[command] = {**intents[command], 'answer': answer}
+        except Exception as e:
+            logger.error("Error parsing queued commands: %s", e)
+            intents = {}
+        
+        for command in commands:
+            await self.process_command(command, intents.get(command))
+    
+    def _keyword_handler(self, command: str):
+        """Handler for a command recognized by phrase before intent parsing, or None"""
+        text = command.lower()
+        for phrases, handler in KEYWORD_COMMANDS:
+            if any(phrase in text for phrase in phrases):
+                return getattr(self, handler)
+        return None
+            
+    def _build_intent_handlers(self) -> dict:
+        """Map intent actions to async handlers taking (intent, command)
+        
+        Handlers are bound once here so dispatch is one lookup and one call.
+        """
+        announce = self._announce_then
+        answer = partial(self._handle_question_intent, self.llm.generate_response_stream)
+        return {
+            'describe_scene': partial(announce, FEEDBACK['describe_scene'],
+                                      partial(self.describe_environment, detailed=True)),
+            'read_text': partial(announce, FEEDBACK['read_text'], self.read_text_around),
+            'recognize_objects': partial(announce, FEEDBACK['recognize_objects'], self.identify_objects),
+            'navigate': self._handle_navigate_intent,
+            'recognize_people': partial(announce, FEEDBACK['recognize_people'], self.recognize_faces),
+            'emergency': partial(announce, FEEDBACK['emergency'], self.handle_emergency),
+            'exit': self._handle_exit_intent,
+            'general_question': answer,
+            'general_questions': answer,
+        }
+    
+    async def _announce_then(self, message: str, action, intent: dict, command: str):
+        """Speak a feedback message, then run an action that takes no arguments"""
+        self.speech.speak(message)
+        await action()
+    
+    async def _handle_navigate_intent(self, intent: dict, command: str):
+        self.speech.speak(FEEDBACK['navigate'])
+        await self.assist_navigation(_intent_parameters(intent))
+    
+    async def _handle_exit_intent(self, intent: dict, command: str):
+        await self.handle_exit()
+        raise KeyboardInterrupt("User requested exit")
+    
+    async def _handle_question_intent(self, respond, intent: dict, command: str):
+        answer = intent.get('answer')
+        if answer is not None:
+            # Generated ahead of time by process_commands
+            self.speech.speak(answer)
+            return
+        # Speak the answer as it streams in
+        await self.speech.speak_stream(respond(command))
+    
+    async def _cached_understand_intent(self, command: str) -> dict:
+        """Understand intent, reusing results for repeated commands
+        
+        Exact repeats hit an LRU dict here, persisted to the intent_cache
+        table across runs; paraphrases fall through to LLMHandler, whose
+        semantic cache can still skip the API call.
+        Set user_context['cache'] to False to bypass.
+        """
+        return (await self._cached_understand_intents([command]))[0]
+    
+    async def _cached_understand_intents(self, commands: list) -> list:
+        """_cached_understand_intent for several commands; misses go to the LLM concurrently"""
+        if not self.user_context.get('cache', True):
+            return await self.llm.understand_intents(commands, self.user_context)
+        
+        keys = [" ".join(command.lower().split()) for command in commands]
+        intents = []
+        for key in keys:
+            intent = self._intent_cache.get(key)
+            if intent is not None:
+                self._intent_cache.move_to_end(key)
+                self.db.record_intent_hit(key)
+            intents.append(intent)
+        
+        misses = [i for i, intent in enumerate(intents) if intent is None]
+        if not misses:
+            return intents
+        
+        parsed = await self.llm.understand_intents([commands[i] for i in misses], self.user_context)
+        for i, intent in zip(misses, parsed):
+            intents[i] = intent
+            if intent.get('fallback'):
+                # A guess after an LLM error; ask again next time
+                continue
+            self._intent_cache[keys[i]] = intent
+            if len(self._intent_cache) > INTENT_CACHE_SIZE:
+                self._intent_cache.popitem(last=False)
+            self.db.record_intent(keys[i], intent)
+        return intents
+    
+    def _load_intent_cache(self):
+        """Seed the intent LRU from the database so restarts start warm"""
+        try:
+            rows = self.db.load_intent_cache(limit=INTENT_CACHE_SIZE)
+            # Most used last, so they are the last to be evicted
+            for key, intent in reversed(rows):
+                self._intent_cache[key] = intent
+            logger.info("Loaded %s cached intents", len(rows))
+        except Exception as e:
+            logger.warning("Could not load intent cache: %s", e)
+    
     async def describe_environment(self, detailed=False):
         """Describe the current environment"""
         try:
@@ -226,7 +425,7 @@ class VisionAssistant:
                 # Speak description
                 if description:
                     self.speech.speak(description)
-                    logger.info(f"Scene: {description}")
+                    logger.info("Scene: %s", description)
                 else:
                     self.speech.speak("Unable to analyze scene at this moment.")
                 
@@ -237,28 +436,36 @@ class VisionAssistant:
                 logger.warning("No camera feed available")
         
         except Exception as e:
-            logger.error(f"Error describing environment: {e}")
+            logger.error("Error describing environment: %s", e)
             self.speech.speak("I encountered an error analyzing the scene.")
         
     async def read_text_around(self):
         """Read any text in the environment"""
         try:
-            image = self.vision.capture_image()
+            # Text must match what the user is pointing at now, so wait for a fresh frame
+            image = await self.vision.capture_image_async()
             if image is not None:
                 self.speech.speak("Scanning for text...")
-                texts = await self.vision.extract_text(image)
                 
-                if texts:
-                    self.speech.speak(f"I found {len(texts)} text regions. Reading them now.")
-                    for i, text in enumerate(texts[:5], 1):
-                        self.speech.speak(f"Text {i}: {text}")
-                        logger.info(f"Extracted text {i}: {text}")
-                else:
+                # Speak each region as soon as OCR reads it
+                count = 0
+                texts = self.vision.extract_text_iter(image)
+                try:
+                    async for text in texts:
+                        count += 1
+                        self.speech.speak(f"Text {count}: {text}")
+                        logger.info("Extracted text %s: %s", count, text)
+                        if count >= 5:
+                            break
+                finally:
+                    await texts.aclose()
+                
+                if count == 0:
                     self.speech.speak("I don't see any readable text around you.")
             else:
                 self.speech.speak("Camera not available for text reading.")
         except Exception as e:
-            logger.error(f"Error reading text: {e}")
+            logger.error("Error reading text: %s", e)
             self.speech.speak("I couldn't read text from the scene.")
             
     async def identify_objects(self):
@@ -272,13 +479,13 @@ class VisionAssistant:
                 if objects:
                     object_list = ", ".join([obj.get('name', 'Unknown') for obj in objects[:5]])
                     self.speech.speak(f"I can see the following objects: {object_list}")
-                    logger.info(f"Detected objects: {object_list}")
+                    logger.info("Detected objects: %s", object_list)
                 else:
                     self.speech.speak("I don't detect any specific objects nearby.")
             else:
                 self.speech.speak("Camera not available for object detection.")
         except Exception as e:
-            logger.error(f"Error identifying objects: {e}")
+            logger.error("Error identifying objects: %s", e)
             self.speech.speak("I couldn't identify objects in the scene.")
             
     async def recognize_faces(self):
@@ -305,13 +512,13 @@ class VisionAssistant:
                             confidence = face.get('confidence', 0)
                             self.speech.speak(f"{face['identity']} detected with {confidence:.0%} confidence")
                     
-                    logger.info(f"Face recognition complete: {len(identified_faces)} faces detected")
+                    logger.info("Face recognition complete: %s faces detected", len(identified_faces))
                 else:
                     self.speech.speak("I don't see any faces around you.")
             else:
                 self.speech.speak("Camera not available for face recognition.")
         except Exception as e:
-            logger.error(f"Error recognizing faces: {e}")
+            logger.error("Error recognizing faces: %s", e)
             self.speech.speak("I couldn't detect faces in the scene.")
             
     async def assist_navigation(self, parameters):
@@ -322,8 +529,15 @@ class VisionAssistant:
             if destination:
                 self.speech.speak(f"Getting directions to {destination}...")
                 
-                # Get current location
-                location = await self.navigation.get_current_location()
+                # Get current location, geocoding the destination meanwhile;
+                # a failed prefetch is retried by get_directions
+                location, _ = await asyncio.gather(
+                    self.navigation.get_current_location(),
+                    self.navigation.geocode(destination),
+                    return_exceptions=True
+                )
+                if isinstance(location, Exception):
+                    raise location
                 if location:
                     self.speech.speak(f"Your current location is {location}")
                 
@@ -340,13 +554,13 @@ class VisionAssistant:
                         instruction = step.get('instruction', '')
                         if instruction:
                             self.speech.speak(instruction)
-                            logger.info(f"Direction: {instruction}")
+                            logger.info("Direction: %s", instruction)
                 else:
                     self.speech.speak(f"I couldn't find directions to {destination}.")
             else:
                 self.speech.speak("Please tell me where you want to go.")
         except Exception as e:
-            logger.error(f"Error navigating: {e}")
+            logger.error("Error navigating: %s", e)
             self.speech.speak("I encountered an error during navigation.")
             
     async def handle_emergency(self):
@@ -369,7 +583,7 @@ class VisionAssistant:
                 f"Emergency alert sent. Your location is {location}. Help is on the way."
             )
         except Exception as e:
-            logger.error(f"Error handling emergency: {e}")
+            logger.error("Error handling emergency: %s", e)
     
     async def _handle_language_switch(self, command: str):
         """Handle language switching"""
@@ -406,7 +620,7 @@ class VisionAssistant:
                     self.user_context['language_name'] = self.speech.get_language_name()
                     lang_name = available_langs[requested_lang]
                     self.speech.speak(f"Language changed to {lang_name}")
-                    logger.info(f"Language switched to: {requested_lang} ({lang_name})")
+                    logger.info("Language switched to: %s (%s)", requested_lang, lang_name)
             else:
                 # List available languages
                 self.speech.speak("Available languages are:")
@@ -415,7 +629,7 @@ class VisionAssistant:
                 self.speech.speak("Which language would you like?")
                 
         except Exception as e:
-            logger.error(f"Error switching language: {e}")
+            logger.error("Error switching language: %s", e)
             self.speech.speak("I couldn't change the language. Please try again.")
     
     async def _handle_face_enrollment(self, command: str):
@@ -442,7 +656,7 @@ class VisionAssistant:
                     
                     if success:
                         self.speech.speak(f"Successfully enrolled {person_name}. I will recognize you next time.")
-                        logger.info(f"Enrolled face: {person_name}")
+                        logger.info("Enrolled face: %s", person_name)
                     else:
                         self.speech.speak(f"Could not detect a clear face. Please try again.")
                 else:
@@ -452,7 +666,7 @@ class VisionAssistant:
                 self.speech.speak("I can enroll your face. Please tell me your name.")
                 
         except Exception as e:
-            logger.error(f"Error enrolling face: {e}")
+            logger.error("Error enrolling face: %s", e)
             self.speech.speak("I encountered an error during face enrollment. Please try again.")
     
     async def _handle_face_management(self, command: str):
@@ -482,7 +696,7 @@ class VisionAssistant:
                     
                     if success:
                         self.speech.speak(f"I've forgotten about {person_name}.")
-                        logger.info(f"Removed person: {person_name}")
+                        logger.info("Removed person: %s", person_name)
                     else:
                         self.speech.speak(f"I don't have {person_name} in my database.")
                 else:
@@ -494,7 +708,7 @@ class VisionAssistant:
                 self.speech.speak(f"I know {stats['total_known_people']} people with {stats['total_encodings']} face samples.")
                 
         except Exception as e:
-            logger.error(f"Error managing faces: {e}")
+            logger.error("Error managing faces: %s", e)
             self.speech.speak("I encountered an error. Please try again.")
     
     async def _handle_audio_assistance(self, command: str):
@@ -584,31 +798,36 @@ class VisionAssistant:
                     self.speech.speak("Audio libraries not available. Please install required packages.")
         
         except Exception as e:
-            logger.error(f"Error in audio assistance: {e}")
+            logger.error("Error in audio assistance: %s", e)
             self.speech.speak("I encountered an error with audio processing. Please try again.")
     
     async def handle_exit(self):
         """Handle user exit/goodbye command"""
         try:
             logger.info("User requested exit")
+            self.stop()
             
             # Provide farewell message
             self.speech.speak("Thank you for using Vision Assistant. Goodbye!")
+            self.speech.wait_until_done()
             
             # Cleanup resources
             self.vision.cleanup()
+            await self.navigation.close()
+            await self.llm.close()
             self.db.close()
             
             logger.info("Vision Assistant stopped gracefully")
         
         except Exception as e:
-            logger.error(f"Error during exit: {e}")
+            logger.error("Error during exit: %s", e)
             self.speech.speak("Shutting down. Goodbye!")
     
     def stop(self):
         """Stop the assistant"""
         logger.info("Stopping Vision Assistant...")
         self.is_listening = False
+        self.speech.stop_listening()
 
 
 async def main():
@@ -631,9 +850,11 @@ async def main():
                 logger.info("Debug mode enabled")
             elif sys.argv[1].startswith('--lang='):
                 language = sys.argv[1].split('=')[1]
-                logger.info(f"Using language: {language}")
+                logger.info("Using language: %s", language)
+        
+        speedup = True if '--speedup' in sys.argv else None
         
-        assistant = VisionAssistant(language=language if language else None)
+        assistant = VisionAssistant(language=language if language else None, speedup=speedup)
         
         # Run continuous assistance
         await assistant.continuous_assistant()
@@ -641,7 +862,7 @@ async def main():
     except KeyboardInterrupt:
         logger.info("Shutting down Vision Assistant...")
     except Exception as e:
-        logger.error(f"Fatal error: {e}")
+        logger.error("Fatal error: %s", e)
         return False
     
     return True
@@ -653,5 +874,5 @@ if __name__ == "__main__":
         success = asyncio.run(main())
         sys.exit(0 if success else 1)
     except Exception as e:
-        logger.error(f"Failed to start application: {e}")
+        logger.error("Failed to start application: %s", e)
         sys.exit(1)
\ No newline at end of file
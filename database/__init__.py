@@ -1,9 +1,10 @@
 """Database module initialization"""
-from .db_handler import DatabaseHandler
+from .db_handler import DatabaseHandler, create_db_engine
 from .models import Base, User, SceneMemory, ConversationHistory, TextExtraction, ObjectDetection
 
 __all__ = [
     "DatabaseHandler",
+    "create_db_engine",
     "Base",
     "User",
     "SceneMemory",
@@ -1,135 +1,489 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, JSON
+from sqlalchemy import create_engine, event, insert, inspect, Column, Integer, String, Float, DateTime, JSON
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from collections import Counter
 from datetime import datetime
 import json
 import os
+import shutil
+import numpy as np
+import queue
+import threading
+import time
 import logging
-from .models import Base, User, ConversationHistory, SceneMemory
+from pathlib import Path
+from .models import (Base, User, ConversationHistory, SceneMemory, TextExtraction, ObjectDetection,
+                     Person, FaceEncoding, IntentCache, utcnow)
 
 logger = logging.getLogger(__name__)
+
+# Try to import orjson for JSON columns, fallback to stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _json_dumps(obj) -> str:
+    if HAS_ORJSON:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _json_loads(data):
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# SQLite file used when neither an argument nor DATABASE_URL names a database.
+# Earlier releases always wrote here, even when DATABASE_URL named another file
+DEFAULT_DB_PATH = 'vision_assistant.db'
+
+# Connection pool settings for server databases; override via environment
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE = 1800  # seconds; stay under server idle timeouts
+
+# Dialect-specific INSERT ... ON CONFLICT constructs for upserts
+_UPSERT_INSERTS = {
+    'sqlite': sqlite_insert,
+    'postgresql': postgresql_insert,
+}
+
+
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    """Enable WAL so writes don't block readers"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def _migrate_legacy_sqlite(database_url: str):
+    """Move DEFAULT_DB_PATH to the SQLite file DATABASE_URL names, if that file doesn't exist yet"""
+    url = make_url(database_url)
+    if url.get_backend_name() != 'sqlite' or not url.database or url.database == ':memory:':
+        return
+    
+    target, legacy = Path(url.database), Path(DEFAULT_DB_PATH)
+    if target.exists() or not legacy.is_file() or target.resolve() == legacy.resolve():
+        return
+    
+    logger.warning(f"Moving existing database {legacy} to {target} named by DATABASE_URL")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # WAL sidecars hold committed rows not yet checkpointed into the main file
+    for suffix in ('', '-wal', '-shm'):
+        source = Path(f"{legacy}{suffix}")
+        if source.exists():
+            shutil.move(str(source), f"{target}{suffix}")
+
+
+def create_db_engine(database_url: str):
+    """
+    Create an engine with pooling suited to the backend
+    
+    Args:
+        database_url: SQLAlchemy URL, e.g. sqlite:///vision_assistant.db
+    """
+    options = {
+        'json_serializer': _json_dumps,
+        'json_deserializer': _json_loads,
+    }
+    
+    if database_url.startswith('sqlite'):
+        # Connections are shared by the event loop and the writer thread
+        options['connect_args'] = {'check_same_thread': False}
+        if database_url in ('sqlite://', 'sqlite:///:memory:'):
+            # Each connection to :memory: is a separate database, so keep exactly one
+            options['poolclass'] = StaticPool
+        else:
+            # A few connections let WAL readers run alongside the writer
+            options['pool_size'] = 4
+    else:
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=30,
+            pool_pre_ping=True,
+            pool_recycle=DB_POOL_RECYCLE
+        )
+    
+    engine = create_engine(database_url, **options)
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, "connect", _configure_sqlite_connection)
+    return engine
+
+# History rows are committed in batches by a background writer
+WRITE_BATCH_SIZE = 200
+WRITE_FLUSH_INTERVAL = 0.2
+
+# Rows kept in intent_cache, pruned at startup by hits then recency
+INTENT_CACHE_MAX_ROWS = 2048
     
 class DatabaseHandler():
-    def __init__(self, db_path='vision_assistant.db'):
+    def __init__(self, db_path=None, database_url=None):
+        """
+        Args:
+            db_path: SQLite database file, used when database_url is not given
+            database_url: Full SQLAlchemy URL for another backend (e.g. PostgreSQL)
+        
+        With neither given, the DATABASE_URL environment variable is used,
+        falling back to DEFAULT_DB_PATH. A database left at DEFAULT_DB_PATH
+        by an earlier release is moved to the SQLite file DATABASE_URL names.
+        """
         print("Initializing Database Handler...")
         
-        self.engine = create_engine(f"sqlite:///{db_path}")
+        if database_url is None and db_path:
+            database_url = f"sqlite:///{db_path}"
+        elif database_url is None:
+            database_url = os.getenv("DATABASE_URL") or f"sqlite:///{DEFAULT_DB_PATH}"
+            _migrate_legacy_sqlite(database_url)
+        self.engine = create_db_engine(database_url)
         Base.metadata.create_all(self.engine)
+        # create_all skips indexes on tables that already exist
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
+        
+        # Log tables created before timestamps had a server default still get them from Python
+        inspector = inspect(self.engine)
+        self._unstamped_models = {
+            model for model in (SceneMemory, ConversationHistory, TextExtraction, ObjectDetection)
+            if not any(column['name'] == 'timestamp' and column['default']
+                       for column in inspector.get_columns(model.__tablename__))
+        }
         
-        Session = sessionmaker(bind=self.engine)
-        self.session = Session()
+        # One session per thread; the handler is shared by the event loop and worker threads
+        self.Session = scoped_session(sessionmaker(bind=self.engine))
+        
+        # Preferences change only through update_user_preferences
+        self._prefs_cache = {}
         
         # Create default user if not exists
         self._create_default_user()
+        self._prune_intent_cache()
+        
+        # Write-behind queue for history rows: (model, fields), None to stop
+        self._write_queue = queue.Queue()
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
         
     def _create_default_user(self):
         """Create default user profile"""
-        user = self.session.query(User).first()
-        
-        if not user:
-            default_user = User(
-                name="Default user",
-                disability_type="visually_impaired",
-                preferences={
-                    "voice_speed": 150,
-                    "voice_type": "female",
-                    "continuous_mode": False,
-                    "detail_level": "normal",
-                    "language": "en"
-                },
-                emergency_contacts=["+1234567890", "family_member@email.com"]
-            )
-            self.session.add(default_user)
-            self.session.commit()
+        with self.Session() as session:
+            user = session.query(User).first()
+            
+            if not user:
+                default_user = User(
+                    name="Default user",
+                    disability_type="visually_impaired",
+                    preferences={
+                        "voice_speed": 150,
+                        "voice_type": "female",
+                        "continuous_mode": False,
+                        "detail_level": "normal",
+                        "language": "en"
+                    },
+                    emergency_contacts=["+1234567890", "family_member@email.com"]
+                )
+                session.add(default_user)
+                session.commit()
             
     def get_user_preferences(self, user_id=1) -> dict:
         """Get user preferences"""
-        user = self.session.query(User).filter_by(id=user_id).first()
+        cached = self._prefs_cache.get(user_id)
+        if cached is not None:
+            # Callers mutate the returned dict, so hand out a copy
+            return dict(cached)
         
-        if user:
-            return {
-                **user.preferences,
-                "emergency_contacts": user.emergency_contacts,
-                "disability_type": user.disability_type
-            }
+        with self.Session() as session:
+            user = session.query(User).filter_by(id=user_id).first()
+            
+            if user:
+                preferences = {
+                    **user.preferences,
+                    "emergency_contacts": user.emergency_contacts,
+                    "disability_type": user.disability_type
+                }
+                self._prefs_cache[user_id] = preferences
+                return dict(preferences)
         return {}
     
     def update_user_preferences(self, preferences: dict, user_id=1):
         """Update user preferences"""
-        user = self.session.query(User).filter_by(id=user_id).first()
-        
-        if user:
-            user.preferences = {**user.preferences, **preferences}
-            self.session.commit()
+        with self.Session() as session:
+            user = session.query(User).filter_by(id=user_id).first()
+            
+            if user:
+                user.preferences = {**user.preferences, **preferences}
+                session.commit()
+                self._prefs_cache.pop(user_id, None)
             
     def save_scene_memory(self, user_id: int, location: str,
                           description: str, objects: list):
-        """Save scene description to memory"""
-        memory = SceneMemory(
-            user_id=user_id,
-            location=location,
-            description=description,
-            objects_detected=objects
-        )
-        self.session.add(memory)
-        self.session.commit()
+        """Queue scene description for saving to memory"""
+        self._write_queue.put((SceneMemory, {
+            'user_id': user_id,
+            'location': location,
+            'scene_description': description,
+            'objects_detected': objects
+        }))
         
     def get_location_history(self, user_id: int, limit: int = 10) -> list:
         """Get location history"""
-        memories = self.session.query(SceneMemory)\
-            .filter_by(user_id=user_id)\
-                .order_by(SceneMemory.timestamp.desc())\
-                    .limit(limit)\
-                        .all()
-                        
-        return [
-            {
-                'location': m.location,
-                'description': m.description,
-                'timestamp': m.timestamp.isoformat()
-            }
-            for m in memories
-        ]
+        with self.Session() as session:
+            memories = session.query(SceneMemory)\
+                .filter_by(user_id=user_id)\
+                    .order_by(SceneMemory.timestamp.desc())\
+                        .limit(limit)\
+                            .all()
+                            
+            return [
+                {
+                    'location': m.location,
+                    'description': m.scene_description,
+                    'timestamp': m.timestamp.isoformat() if m.timestamp else None
+                }
+                for m in memories
+            ]
+        
+    def log_text_extractions(self, user_id: int, texts: list, language: str = "en"):
+        """Queue OCR results, as (text, confidence) pairs, for the text_extractions log"""
+        for text, confidence in texts:
+            self._write_queue.put((TextExtraction, {
+                'user_id': user_id,
+                'extracted_text': text,
+                'confidence': confidence,
+                'language': language
+            }))
+    
+    def log_object_detections(self, user_id: int, objects: list):
+        """Queue detect_objects results for the object_detections log"""
+        for obj in objects:
+            self._write_queue.put((ObjectDetection, {
+                'user_id': user_id,
+                'object_name': obj.get('name'),
+                'confidence': obj.get('confidence'),
+                'bounding_box': obj.get('bbox')
+            }))
         
     def save_conversation(self, user_id: int,
                           user_input: str,
                           assistant_response: str):
-        """Save conversation to history"""
-        conversation = ConversationHistory(
-            user_id=user_id,
-            user_input=user_input,
-            assistant_response=assistant_response
-        )
-        self.session.add(conversation)
-        self.session.commit()
+        """Queue conversation for saving to history"""
+        self._write_queue.put((ConversationHistory, {
+            'user_id': user_id,
+            'user_message': user_input,
+            'assistant_response': assistant_response
+        }))
+    
+    def _writer_loop(self):
+        """Commit queued history rows, up to WRITE_BATCH_SIZE per transaction"""
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                return
+            
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + WRITE_FLUSH_INTERVAL
+            while len(batch) < WRITE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._write_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            self._commit_batch(batch)
+            if stopping:
+                return
+    
+    def _commit_batch(self, batch: list):
+        """Insert a batch of (model, fields) rows in one transaction, one executemany per table"""
+        # One timestamp per batch; log rows are normally stamped by the database instead
+        now = utcnow()
+        rows_by_model = {}
+        for model, fields in batch:
+            rows_by_model.setdefault(model, []).append(fields)
+        
+        # Intent upserts commit on their own so a conflict there can't drop history rows
+        intents = rows_by_model.pop(IntentCache, None)
+        if intents:
+            # Rows without an intent are hits served from the in-memory cache
+            hits = Counter(row['key'] for row in intents if 'intent' not in row)
+            intents = [{**row, 'hits': 1, 'last_used': now} for row in intents if 'intent' in row]
+            try:
+                with self.Session() as session:
+                    if intents:
+                        self._upsert_intents(session, intents)
+                    if hits:
+                        self._count_intent_hits(session, hits, now)
+                    session.commit()
+            except Exception as e:
+                logger.error(f"Error saving {len(intents) + len(hits)} cached intents: {e}")
+        
+        if not rows_by_model:
+            return
+        try:
+            with self.Session() as session:
+                for model, rows in rows_by_model.items():
+                    if model in self._unstamped_models:
+                        rows = [{**row, 'timestamp': now} for row in rows]
+                    session.execute(insert(model), rows)
+                session.commit()
+        except Exception as e:
+            logger.error(f"Error saving {sum(map(len, rows_by_model.values()))} history rows: {e}")
+        
+    def record_intent(self, key: str, intent: dict):
+        """Queue a newly parsed intent for the intent cache table"""
+        # Only well-formed, non-fallback intents are worth reloading on the next start
+        if not (isinstance(intent, dict)
+                and isinstance(intent.get('action'), str)
+                and isinstance(intent.get('parameters', {}), dict)
+                and not intent.get('fallback')):
+            logger.debug(f"Not caching invalid intent for {key!r}: {intent}")
+            return
+        self._write_queue.put((IntentCache, {'key': key, 'intent': intent}))
+    
+    def record_intent_hit(self, key: str):
+        """Queue a hit for an intent answered from the in-memory cache"""
+        # Keeps hits and last_used current, since load and prune rank by them
+        self._write_queue.put((IntentCache, {'key': key}))
+    
+    def _count_intent_hits(self, session, hits: Counter, now: datetime):
+        """Add queued cache hits to stored rows, one UPDATE per distinct count"""
+        keys_by_count = {}
+        for key, count in hits.items():
+            keys_by_count.setdefault(count, []).append(key)
+        for count, keys in keys_by_count.items():
+            session.query(IntentCache)\
+                .filter(IntentCache.key.in_(keys))\
+                    .update({IntentCache.hits: IntentCache.hits + count, IntentCache.last_used: now},
+                            synchronize_session=False)
+    
+    def _upsert_intents(self, session, rows: list):
+        """Insert intent rows, bumping hits and last_used for keys already stored"""
+        make_insert = _UPSERT_INSERTS.get(self.engine.dialect.name)
+        if make_insert is not None:
+            stmt = make_insert(IntentCache)
+            session.execute(stmt.on_conflict_do_update(
+                index_elements=[IntentCache.key],
+                set_={
+                    'intent': stmt.excluded.intent,
+                    'hits': IntentCache.hits + 1,
+                    'last_used': stmt.excluded.last_used
+                }
+            ), rows)
+            return
+        
+        # No ON CONFLICT for this dialect: update the keys that exist, insert the rest
+        rows = list({row['key']: row for row in rows}.values())
+        existing = {
+            cached.key: cached for cached in session.query(IntentCache)
+                .filter(IntentCache.key.in_([row['key'] for row in rows]))
+        }
+        for row in rows:
+            cached = existing.get(row['key'])
+            if cached is None:
+                session.add(IntentCache(**row))
+            else:
+                cached.intent = row['intent']
+                cached.hits = (cached.hits or 0) + 1
+                cached.last_used = row['last_used']
+    
+    def load_intent_cache(self, limit: int = 1024) -> list:
+        """Get persisted (key, intent) pairs, most used first"""
+        with self.Session() as session:
+            return session.query(IntentCache.key, IntentCache.intent)\
+                .order_by(IntentCache.hits.desc(), IntentCache.last_used.desc())\
+                    .limit(limit)\
+                        .all()
+    
+    def _prune_intent_cache(self):
+        """Keep only the INTENT_CACHE_MAX_ROWS most used intent cache rows"""
+        with self.Session() as session:
+            keep = session.query(IntentCache.key)\
+                .order_by(IntentCache.hits.desc(), IntentCache.last_used.desc())\
+                    .limit(INTENT_CACHE_MAX_ROWS)
+            session.query(IntentCache)\
+                .filter(IntentCache.key.not_in(keep.scalar_subquery()))\
+                    .delete(synchronize_session=False)
+            session.commit()
         
     def get_conversation_history(self, user_id: int, limit: int = 20) -> list:
         """Get conversation history"""
-        conversations = self.session.query(ConversationHistory)\
-            .filter_by(user_id=user_id)\
-                .order_by(ConversationHistory.timestamp.desc())\
-                    .limit(limit)\
+        with self.Session() as session:
+            conversations = session.query(ConversationHistory)\
+                .filter_by(user_id=user_id)\
+                    .order_by(ConversationHistory.timestamp.desc())\
+                        .limit(limit)\
+                            .all()
+                            
+            return [
+                {
+                    'user_input': c.user_message,
+                    'assistant': c.assistant_response,
+                    'timestamp': c.timestamp.isoformat() if c.timestamp else None
+                }
+                for c in conversations
+            ]
+        
+    def add_known_face(self, user_id: int, name: str, face_data: dict):
+        """Add known face to database
+        
+        Args:
+            user_id: Owning app user
+            name: Person the face belongs to
+            face_data: Dict with 'embedding' (face encoding vector) and optional 'source'
+        """
+        # FP16 halves storage; recognition distances are unaffected at this precision
+        embedding = np.asarray(face_data['embedding'], dtype=np.float16)
+        
+        with self.Session() as session:
+            person = session.query(Person)\
+                .filter_by(user_id=str(user_id), person_name=name)\
+                    .first()
+            if not person:
+                person = Person(user_id=str(user_id), person_name=name)
+                session.add(person)
+                session.flush()
+            
+            session.add(FaceEncoding(
+                person_id=person.id,
+                person_name=name,
+                encoding=embedding.tobytes(),
+                encoding_metadata={'dtype': 'float16', 'shape': list(embedding.shape)},
+                source=face_data.get('source', 'manual')
+            ))
+            session.commit()
+    
+    def get_known_faces(self, user_id: int) -> list:
+        """Get known faces for user as [{'name', 'embedding'}] with float32 embeddings"""
+        with self.Session() as session:
+            rows = session.query(FaceEncoding.person_name, FaceEncoding.encoding, FaceEncoding.encoding_metadata)\
+                .join(Person, Person.id == FaceEncoding.person_id)\
+                    .filter(Person.user_id == str(user_id), Person.active.is_(True))\
                         .all()
-                        
+        
         return [
             {
-                'user_input': c.user_input,
-                'assistant': c.assistant_response,
-                'timestamp': c.timestamp.isoformat()
+                'name': name,
+                'embedding': np.frombuffer(encoding, dtype=(metadata or {}).get('dtype', 'float16'))
+                    .astype(np.float32)
             }
-            for c in conversations
+            for name, encoding, metadata in rows
         ]
-        
-    def add_known_face(self, user_id: int, name: str, face_data: dict):
-        """Add known face to database"""
-        # This would store face embeddings
-        # For now, implement as needed
-        pass
-    
-    def get_known_faces(self, user_id: int) -> list:
-        """Get known faces for user"""
-        # Retrieve from database
-        return []
     
     async def send_emergency_alert(self, emergency_contacts: list) -> bool:
         """Send emergency alert to contacts
@@ -161,5 +515,12 @@ class DatabaseHandler():
             return False
     
     def close(self):
-        """Close database connection"""
-        self.session.close()
\ No newline at end of file
+        """Flush queued history and close database connection"""
+        self._write_queue.put(None)
+        self._writer_thread.join()
+        self.Session.remove()
+        if self.engine.dialect.name == 'sqlite':
+            # Let SQLite refresh query planner statistics for the indexes it used
+            with self.engine.connect() as connection:
+                connection.exec_driver_sql("PRAGMA optimize")
+        self.engine.dispose()
\ No newline at end of file
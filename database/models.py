@@ -1,10 +1,64 @@
 """Database ORM Models for Vision Assistant"""
-from sqlalchemy import Column, String, DateTime, Integer, Float, Boolean, Text, JSON, LargeBinary
+from sqlalchemy import Column, String, DateTime, Integer, Float, Boolean, Text, JSON, LargeBinary, Index
 from sqlalchemy.ext.declarative import declarative_base
-from datetime import datetime
+from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from datetime import date, datetime, time, timedelta, timezone
 
 Base = declarative_base()
 
+# Native JSON column; JSONB on PostgreSQL so it can be indexed and queried
+JSONDocument = JSON().with_variant(JSONB(), 'postgresql')
+
+
+def utcnow() -> datetime:
+    """Timezone-aware current UTC time (datetime.utcnow is deprecated)"""
+    return datetime.now(timezone.utc)
+
+
+class server_utcnow(FunctionElement):
+    """Current UTC time evaluated by the database, for server-side column defaults"""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(server_utcnow)
+def _utcnow_default(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(server_utcnow, 'postgresql')
+def _utcnow_postgresql(element, compiler, **kw):
+    # now() follows the session time zone; naive columns store UTC like utcnow()
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+class TimeRangeMixin:
+    """Sargable time-range queries for log tables with user_id and timestamp
+    
+    Filters compare the bare timestamp column against half-open bounds so the
+    (user_id, timestamp) index is used; wrapping the column in date() or
+    strftime() would force a full scan.
+    """
+    
+    @classmethod
+    def between(cls, session, user_id, start: datetime, end: datetime):
+        """Query rows for a user with start <= timestamp < end"""
+        return session.query(cls).filter(
+            cls.user_id == user_id,
+            cls.timestamp >= start,
+            cls.timestamp < end
+        )
+    
+    @classmethod
+    def date_range(cls, session, user_id, day: date):
+        """Query rows for a user on one (UTC) calendar day"""
+        start = datetime.combine(day, time.min)
+        return cls.between(session, user_id, start, start + timedelta(days=1))
+
 
 class User(Base):
     """User preferences and profile"""
@@ -19,8 +73,32 @@ class User(Base):
     speech_rate = Column(Integer, default=150)
     preferences = Column(JSON)  # Store user preferences as JSON
     emergency_contacts = Column(JSON)  # Store emergency contacts as JSON
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
+    
+    # History logs reference users by str(User.id) without a foreign key. Lazy loading
+    # is disabled to rule out N+1 queries; load explicitly, e.g.
+    # session.scalars(select(User).options(selectinload(User.conversations)))
+    conversations = relationship(
+        "ConversationHistory",
+        primaryjoin="cast(User.id, String) == foreign(ConversationHistory.user_id)",
+        viewonly=True, lazy='raise'
+    )
+    scenes = relationship(
+        "SceneMemory",
+        primaryjoin="cast(User.id, String) == foreign(SceneMemory.user_id)",
+        viewonly=True, lazy='raise'
+    )
+    detections = relationship(
+        "ObjectDetection",
+        primaryjoin="cast(User.id, String) == foreign(ObjectDetection.user_id)",
+        viewonly=True, lazy='raise'
+    )
+    text_extractions = relationship(
+        "TextExtraction",
+        primaryjoin="cast(User.id, String) == foreign(TextExtraction.user_id)",
+        viewonly=True, lazy='raise'
+    )
 
 
 class Person(Base):
@@ -31,7 +109,7 @@ class Person(Base):
     user_id = Column(String, index=True)  # Belongs to which app user
     person_name = Column(String, index=True)  # Name of the person to recognize
     relationship = Column(String, default="contact")  # friend, family, colleague, etc.
-    enrollment_date = Column(DateTime, default=datetime.utcnow)
+    enrollment_date = Column(DateTime, default=utcnow)
     active = Column(Boolean, default=True)
     notes = Column(Text)  # Additional info about the person
 
@@ -47,55 +125,83 @@ class FaceEncoding(Base):
     encoding_metadata = Column(JSON)  # Metadata: shape, model_used, etc.
     source = Column(String, default="manual")  # manual, auto-detected, etc.
     confidence = Column(Float, default=1.0)  # Confidence of encoding
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
 
 
-class SceneMemory(Base):
+class SceneMemory(TimeRangeMixin, Base):
     """Historical scene descriptions and memories"""
     __tablename__ = "scene_memories"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, index=True)
+    user_id = Column(String)  # Indexed by the (user_id, timestamp) index below
     scene_description = Column(Text)
-    objects_detected = Column(Text)  # JSON list
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    objects_detected = Column(JSONDocument)  # List of object names
+    timestamp = Column(DateTime, server_default=server_utcnow(), nullable=False)
     location = Column(String)
     image_hash = Column(String, unique=True)
+    
+    # Serves the latest-N-per-user query in get_location_history
+    __table_args__ = (
+        Index('ix_scene_user_ts', user_id, timestamp.desc()),
+    )
 
 
-class ConversationHistory(Base):
+class ConversationHistory(TimeRangeMixin, Base):
     """Chat logs and conversation history"""
     __tablename__ = "conversation_history"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, index=True)
+    user_id = Column(String)  # Indexed by the (user_id, timestamp) index below
     user_message = Column(Text)
     assistant_response = Column(Text)
     intent = Column(String)
     confidence = Column(Float)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, server_default=server_utcnow(), nullable=False)
+    
+    # Serves the latest-N-per-user query in get_conversation_history
+    __table_args__ = (
+        Index('ix_conv_user_ts', user_id, timestamp.desc()),
+    )
 
 
-class TextExtraction(Base):
+class TextExtraction(TimeRangeMixin, Base):
     """OCR text extraction log"""
     __tablename__ = "text_extractions"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, index=True)
+    user_id = Column(String)  # Indexed by the (user_id, timestamp) index below
     extracted_text = Column(Text)
     confidence = Column(Float)
     language = Column(String)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, server_default=server_utcnow(), nullable=False)
+    
+    __table_args__ = (
+        Index('ix_text_user_ts', user_id, timestamp.desc()),
+    )
 
 
-class ObjectDetection(Base):
+class ObjectDetection(TimeRangeMixin, Base):
     """Object detection log"""
     __tablename__ = "object_detections"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, index=True)
+    user_id = Column(String)  # Indexed by the (user_id, timestamp) index below
     object_name = Column(String)
     confidence = Column(Float)
-    bounding_box = Column(Text)  # JSON coordinates
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    bounding_box = Column(JSONDocument)  # [x1, y1, x2, y2]
+    timestamp = Column(DateTime, server_default=server_utcnow(), nullable=False)
+    
+    __table_args__ = (
+        Index('ix_object_user_ts', user_id, timestamp.desc()),
+    )
+
+
+class IntentCache(Base):
+    """Parsed intents for normalized commands, reloaded at startup"""
+    __tablename__ = "intent_cache"
+    
+    key = Column(String, primary_key=True)  # Normalized command text
+    intent = Column(JSON)
+    hits = Column(Integer, default=0)
+    last_used = Column(DateTime, default=utcnow, index=True)
@@ -2,22 +2,134 @@ import os
 import sys
 import subprocess
 import platform
+from pathlib import Path
+from urllib.request import urlretrieve
+
+# Virtual environment layout, resolved once for this platform
+IS_WINDOWS = platform.system() == "Windows"
+VENV_DIR = Path("venv")
+VENV_BIN = VENV_DIR / ("Scripts" if IS_WINDOWS else "bin")
+VENV_PIP = VENV_BIN / "pip"
+VENV_PYTHON = VENV_BIN / "python"
+
+ENV_TEMPLATE = """# API Keys Configuration
+OPENAI_API_KEY=your_openai_api_key_here
+GOOGLE_MAPS_API_KEY=your_google_maps_api_key_here
+WEATHER_API_KEY=your_weather_api_key_here
+
+# Database Configuration
+DATABASE_URL=sqlite:///database/vision_assistant.db
+DB_POOL_SIZE=10
+DB_MAX_OVERFLOW=20
+
+# Application Settings
+DEBUG=True
+LOG_LEVEL=INFO
+
+# Speech Settings
+DEFAULT_LANGUAGE=en
+SPEECH_RATE=150
+USE_GOOGLE_TTS=False
+
+# Vision Settings
+CAMERA_INDEX=0
+DETECTION_CONFIDENCE=0.5
+
+# Emergency Contacts (comma separated)
+EMERGENCY_CONTACTS=+1234567890,family@email.com
+"""
+
+YAML_TEMPLATE = """app:
+  name: "Vision Assistant for Visually Impaired (AIForUs)"
+  version: "0.0.1"
+  debug: true
+
+ai:
+  llm_provider: "openai"
+  local_model: "microsoft/DialoGPT-small"
+  vision_model: "yolov8n"
+  text_model: "easyocr"
+
+speech:
+  default_language: "en"
+  speech_rate: 150
+  use_google_tts: false
+
+user:
+  default_name: "User"
+  disability_type: "visual_impaired"
+  emergency_contacts: ["+1234567890", "family@email.com"]
+
+database:
+  path: "database/vision_assistant.db"
+  backup_hours: 24
+
+logging:
+  level: "INFO"
+  file: "logs/app.log"
+  max_size_mb: 10
+"""
+
+# Quantized YuNet face detector; without it face detection falls back to a Haar cascade
+FACE_MODEL_URL = ("https://github.com/opencv/opencv_zoo/raw/main/models/face_detection_yunet/"
+                  "face_detection_yunet_2023mar_int8.onnx")
+FACE_MODEL_PATH = Path("models") / "face_detection_yunet_2023mar_int8.onnx"
+
+# pip's wheel/download cache, kept outside the venv so re-creating it doesn't re-download
+PIP_CACHE_DIR = Path.home() / ".cache" / "aiforus-pip"
+
+# Building these from source takes many minutes; fail fast instead if no wheel exists
+BINARY_ONLY_PACKAGES = ("torch", "torchvision", "numpy", "opencv-python-headless")
+
+# Written only when missing, so user edits are kept
+CONFIG_TEMPLATES = {
+    Path('.env'): ENV_TEMPLATE,
+    Path('config.yaml'): YAML_TEMPLATE,
+}
+
+WINDOWS_SCRIPTS = {
+    Path('activate_env.bat'): """@echo off
+echo Activating Virtual Environment...
+call venv\\Scripts\\activate.bat
+echo Environment activated!
+echo.
+echo To run the application: python app.py
+echo.
+cmd /k
+""",
+    Path('run.bat'): """@echo off
+echo Starting Vision Assistant...
+call venv\\Scripts\\activate.bat
+python app.py
+pause
+""",
+}
+
+UNIX_SCRIPTS = {
+    Path('activate_env.sh'): """#!/bin/bash
+echo "Activating Virtual Environment..."
+source venv/bin/activate
+echo "Environment activated!"
+echo ""
+echo "To run the application: python app.py"
+echo ""
+exec $SHELL
+""",
+    Path('run.sh'): """#!/bin/bash
+echo "Starting Vision Assistant..."
+source venv/bin/activate
+python app.py
+""",
+}
 
 def create_virtual_environment():
     """Create virtual environment if it doesn't exists"""
-    venv_dir = 'venv'
-    
-    if not os.path.exists(venv_dir):
-        subprocess.check_call([sys.executable, '-m', 'venv', venv_dir])
-        print(f"Virtual environment created at {venv_dir}")
+    if not VENV_DIR.exists():
+        subprocess.check_call([sys.executable, '-m', 'venv', str(VENV_DIR)])
+        print(f"Virtual environment created at {VENV_DIR}")
         
         # Install pip and setuptools
-        if platform.system() == "Windows":
-            pip_path = os.path.join(venv_dir, "Scripts", "pip")
-        else:
-            pip_path = os.path.join(venv_dir, "bin", "pip")
-            
-        subprocess.check_call([pip_path, "install", "--upgrade", "pip", "setuptools"])
+        subprocess.check_call([str(VENV_PIP), "install", "--upgrade", "pip", "setuptools"])
         return True
     else:
         print("Virtual environment already exists")
@@ -25,21 +137,22 @@ def create_virtual_environment():
     
 def install_requirements():
         """Install requirements virtual environment"""
-        system = platform.system()
+        pip_path = str(VENV_PIP)
+        python_path = str(VENV_PYTHON)
         
-        if system == "Windows":
-            pip_path = os.path.join("venv", "Scripts", "pip")
-            python_path = os.path.join("venv", "Scripts", "python")
-        else:
-            pip_path = os.path.join("venv", "bin", "pip")
-            python_path = os.path.join("venv", "bin", "python")
-            
         print(f"Using Python: {python_path}")
         print(f"Using Pip: {pip_path}")
         
-        # Install requirements
+        # Install requirements from wheels where possible, reusing a persistent download cache
         print("Installing requirements...")
-        subprocess.check_call([pip_path, "install", "-r", "requirements.txt"])
+        env = {**os.environ, "PIP_CACHE_DIR": str(PIP_CACHE_DIR)}
+        subprocess.check_call([
+            pip_path, "install",
+            "--prefer-binary",
+            f"--only-binary={','.join(BINARY_ONLY_PACKAGES)}",
+            "--upgrade-strategy", "only-if-needed",
+            "-r", "requirements.txt"
+        ], env=env)
         
         return python_path
     
@@ -63,164 +176,70 @@ def setup_environment():
         os.makedirs(directory, exist_ok=True)
         print(f"Created directory: {directory}")
         
-        # Create virtual environment
-        create_virtual_environment()
-        
-        # Install requirements
-        python_path = install_requirements()
-        
-        # Download models
-        print("Downloading AI Models...")
-        download_models(python_path)
-        
-        # Create configuration files
-        create_config_files()
-        
-        print("\n" + "="*50)
-        print("SETUP COMPLETE!")
-        print("="*50)
+    # Create virtual environment
+    create_virtual_environment()
+    
+    # Install requirements
+    python_path = install_requirements()
+    
+    # Download models
+    print("Downloading AI Models...")
+    download_models(python_path)
+    
+    # Create configuration files
+    create_config_files()
+    
+    print("\n" + "="*50)
+    print("SETUP COMPLETE!")
+    print("="*50)
         
 def download_models(python_path):
-    """Download necessary AI Models"""
+    """Check that the AI packages are installed in the virtual environment and fetch the face detector"""
     print("Note: Models will be downloaded on first run.")
     
-    # Create a script to download models
-    download_script = """
-    import torch
-    import cv2
-    from transformers import pipeline
-    print("PyTorch version:", torch.__version__)
-    print("OpenCV version:", cv2.__version__)
+    # find_spec locates the packages without importing them (torch alone takes seconds);
+    # it has to run in the venv's interpreter, so this is one short subprocess
+    check_script = (
+        "import importlib.util, sys; "
+        "missing = [m for m in ('torch', 'cv2', 'transformers') if importlib.util.find_spec(m) is None]; "
+        "sys.exit('Missing packages: ' + ', '.join(missing) if missing else 0)"
+    )
+    subprocess.check_call([python_path, "-c", check_script])
+    download_face_model()
     print("Models will be downloaded automatically on first use")
-    """
     
-    with open("check_models.py", "w") as f:
-        f.write(download_script)
-        
-    # Run the script
-    subprocess.check_call([python_path, "check_models.py"])
-    os.remove("check_models.py")
+def download_face_model():
+    """Fetch the YuNet face detector, which no package downloads on first use"""
+    if FACE_MODEL_PATH.exists():
+        print(f"Face detector already present at {FACE_MODEL_PATH}")
+        return
+    
+    partial = FACE_MODEL_PATH.with_suffix(".part")
+    try:
+        urlretrieve(FACE_MODEL_URL, str(partial))
+        partial.replace(FACE_MODEL_PATH)
+        print(f"Downloaded face detector to {FACE_MODEL_PATH}")
+    except OSError as e:
+        partial.unlink(missing_ok=True)
+        print(f"WARNING: Could not download face detector ({e}); using Haar cascade instead")
     
 def create_config_files():
     """Create configuration files if they don't exist"""
+    for path, body in CONFIG_TEMPLATES.items():
+        if not path.exists():
+            path.write_text(body)
+            print(f"Created {path}")
     
-    # Create .env file
-    if not os.path.exists('.env'):
-        with open('.env', 'w') as f:
-            f.write("""# API Keys Configuration
-                    OPENAI_API_KEY=your_openai_api_key_here
-                    GOOGLE_MAPS_API_KEY=your_google_maps_api_key_here
-                    WEATHER_API_KEY=your_weather_api_key_here
-                    
-                    # Database Configuration
-                    DATABASE_URL=sqlite:///database/vision_assistant.db
-                    
-                    # Application Settings
-                    DEBUG=True
-                    LOG_LEVEL=INFO
-                    
-                    # Speech Settings
-                    DEFAULT_LANGUAGE=en
-                    SPEECH_RATE=150
-                    USE_GOOGLE_TTS=False
-                    
-                    # Vision Settings
-                    CAMERA_INDEX=0
-                    DETECTION_CONFIDENCE=0.5
-                    
-                    # Emergency Contacts (comma separated)
-                    EMERGENCY_CONTACTS=+1234567890,family@email.com
-                    """)
-            print("Created .env file - Please update with your API keys")
-            
-    # Create config .yaml if not exists
-    if not os.path.exists('config.yaml'):
-        with open('config.yaml', 'w') as f:
-            f.write("""app:
-                    name: "Vision Assistant for Visually Impaired (AIForUs)"
-                    version: "0.0.1"
-                    debug: true
-                    
-                    ai:
-                    llm_provider: "openai"
-                    local_model: "microsoft/DialoGPT-small"
-                    vision_model: "yolov8n"
-                    text_model: "easyocr"
-                    
-                    speech:
-                    default_language: "en"
-                    speech_rate: 150
-                    use_google_tts: false
-                    
-                    user:
-                    default_name: "User"
-                    disability_type: "visual_impaired"
-                    emergency_contacts: ["+1234567890", "family@email.com"]
-                    
-                    database:
-                    path: "database/vision_assistant.db"
-                    backup_hours: 24
-                    
-                    logging:
-                    level: "INFO"
-                    file: "logs/app.log"
-                    max_size_mb: 10
-                    """)
-            print("Created config.yaml")
-            
 def create_activation_scripts():
     """Create scripts to activate virtual environment"""
-    system = platform.system()
+    scripts = WINDOWS_SCRIPTS if IS_WINDOWS else UNIX_SCRIPTS
     
-    if system == "Windows":
-        """Create activation script for Windows"""
-        with open("activate_env.bat", "w") as f:
-            f.write("""@echo off
-                    echo Activating Virtual Environment...
-                    call venv\\Scripts\\activate.bat
-                    echo Environment activated!
-                    echo.
-                    echo To run the application: python app.py
-                    echo.
-                    cmd /k
-                    """)
-            
-        # Create run script for Windows
-        with open("run.bat", "w") as f:
-            f.write("""@echo off
-                    echo Starting Vision Assistant...
-                    call venv\\Scripts\\activate.bat
-                    python app.py
-                    pause
-                    """)
-            
-            print("Created Windows scripts: activate_env.bat, run.bat")
-            
-    else: # Linux/Mac
-        # Create activation script for Unix
-        with open("activate_env.sh", "w") as f:
-            f.write("""#!/bin/bash
-                    echo "Activating Virtual Environment..."
-                    echo "Activating Virtual Environment..."
-                    source venv/bin/activate
-                    echo "Environment activated!"
-                    echo ""
-                    echo "To run the application: python app.py"
-                    echo ""
-                    exec $SHELL
-                    """)
-            os.chmod("activate_env.sh", 0o755)
-                    
-            # Create run script for Unix
-            with open("run.sh", "w") as f:
-                f.write("""#!/bin/bash
-                    echo "Starting Vision Assistant...
-                    source venv/bin/activate
-                    python app.py
-                    """)
-                os.chmod("run.sh", 0o755)
-                    
-                print("Created Unix scripts: activate_env.sh, run.sh")
+    for path, body in scripts.items():
+        path.write_text(body)
+        if path.suffix == ".sh":
+            path.chmod(0o755)
+    
+    print(f"Created scripts: {', '.join(str(path) for path in scripts)}")
         
 def check_system():
     """Check system requirements"""
@@ -255,42 +274,43 @@ def check_system():
     print("3. Speakers or headphones")
     print("4. Internet connection (for some features)")
     
-    if __name__ == "__main__":
-        print("="*50)
-        print("VISION ASSISTANT (AIForUs) - DEVELOPMENT SETUP")
+
+if __name__ == "__main__":
+    print("="*50)
+    print("VISION ASSISTANT (AIForUs) - DEVELOPMENT SETUP")
+    print("="*50)
+    
+    try:
+        setup_environment()
+        create_activation_scripts()
+        check_system()
+        
+        print("\n" + "="*50)
+        print("NEXT STEPS:")
         print("="*50)
+        print("1. Edit the '.env' file and add your API keys")
+        print("2. Activate the virtual environment")
         
-        try:
-            setup_environment()
-            create_activation_scripts()
-            check_system()
-            
-            print("\n" + "="*50)
-            print("NEXT STEPS:")
-            print("="*50)
-            print("1. Edit the '.env' file and add your API keys")
-            print("2. Activate the virtual environment")
-            
-            if platform.system() == "Windows":
-                print(" Run: activate_env.bat")
-                print(" OR: venv\\Scripts\\activate.bat")
-                print(" Then run: python app.py")
-                print(" OR just double-click: run.bat")
-            else:
-                print(" Run: source activate_env.sh")
-                print(" OR: source venv/bin/activate")
-                print(" Then run: python app.py")
-                print(" OR: ./run.sh")
-                
-            print("\n3. For first time setup, you might need to:")
-            print(" - Allow camera/microphone access")
-            print(" - Install system dependencies (if prompted)")
-            print("\nEnjoy your Vision Assistant")
+        if IS_WINDOWS:
+            print(" Run: activate_env.bat")
+            print(" OR: venv\\Scripts\\activate.bat")
+            print(" Then run: python app.py")
+            print(" OR just double-click: run.bat")
+        else:
+            print(" Run: source activate_env.sh")
+            print(" OR: source venv/bin/activate")
+            print(" Then run: python app.py")
+            print(" OR: ./run.sh")
             
-        except Exception as e:
-            print(f"\nSetup failed: {e}")
-            print("\nManual setup:")
-            print("1. python -m venv venv")
-            print("2. source venv/bin/activate # or venv\\Scripts\\activate.bat")
-            print("3. pip install -r requirements.txt")
-            print("4. python app.py")
\ No newline at end of file
+        print("\n3. For first time setup, you might need to:")
+        print(" - Allow camera/microphone access")
+        print(" - Install system dependencies (if prompted)")
+        print("\nEnjoy your Vision Assistant")
+        
+    except Exception as e:
+        print(f"\nSetup failed: {e}")
+        print("\nManual setup:")
+        print("1. python -m venv venv")
+        print("2. source venv/bin/activate # or venv\\Scripts\\activate.bat")
+        print("3. pip install -r requirements.txt")
+        print("4. python app.py")
\ No newline at end of file
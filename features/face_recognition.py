@@ -6,6 +6,8 @@ import pickle
 from pathlib import Path
 import yaml
 
+from utils.similarity import nearest_l2
+
 logger = logging.getLogger(__name__)
 
 # Try to import face_recognition, fallback to placeholder
@@ -43,6 +45,8 @@ class FaceRecognizer:
         # Storage
         self.encodings_db = {}  # {person_name: [encodings]}
         self.face_cache = {}  # Cache for detected faces
+        self._known_matrix = None  # All known encodings stacked, rebuilt when encodings_db changes
+        self._known_names = []  # Person name per matrix row
         self._load_known_faces()
         
         logger.info(f"FaceRecognizer initialized (recognition: {enable_recognition}, model: {self.model})")
@@ -160,17 +164,14 @@ class FaceRecognizer:
                 if encoding is None:
                     continue
                 
-                # Compare against known faces
+                # Compare against all known faces at once
                 best_match_name = 'Unknown'
                 best_match_distance = float('inf')
                 
-                for person_name, known_encodings in self.encodings_db.items():
-                    for known_encoding in known_encodings:
-                        distance = face_recognition.face_distance([known_encoding], encoding)[0]
-                        
-                        if distance < best_match_distance:
-                            best_match_distance = distance
-                            best_match_name = person_name
+                known_matrix = self._get_known_matrix()
+                if known_matrix is not None:
+                    index, best_match_distance = nearest_l2(known_matrix, encoding)
+                    best_match_name = self._known_names[index]
                 
                 # Set identity if match confidence is high enough
                 if best_match_distance <= self.max_distance:
@@ -187,6 +188,19 @@ class FaceRecognizer:
             logger.error(f"Error recognizing faces: {e}")
             return faces
     
+    def _get_known_matrix(self) -> Optional[np.ndarray]:
+        """Stack known encodings into one (n, dim) matrix, cached until they change"""
+        if self._known_matrix is None:
+            names, encodings = [], []
+            for person_name, known_encodings in self.encodings_db.items():
+                for known_encoding in known_encodings:
+                    names.append(person_name)
+                    encodings.append(known_encoding)
+            if encodings:
+                self._known_matrix = np.asarray(encodings, dtype=np.float32)
+                self._known_names = names
+        return self._known_matrix
+    
     def enroll_face(self, person_name: str, face_encoding: np.ndarray) -> bool:
         """
         Register a new face for future identification (training)
@@ -214,6 +228,7 @@ class FaceRecognizer:
             
             # Add encoding
             self.encodings_db[person_name].append(face_encoding)
+            self._known_matrix = None
             logger.info(f"Enrolled face for {person_name} ({len(self.encodings_db[person_name])} samples)")
             
             # Auto-save if configured
@@ -264,6 +279,7 @@ class FaceRecognizer:
         try:
             if person_name in self.encodings_db:
                 del self.encodings_db[person_name]
+                self._known_matrix = None
                 self._save_known_faces()
                 logger.info(f"Removed {person_name} from database")
                 return True
@@ -0,0 +1,19 @@
+"""Geo Kernels - Great-circle distance helpers for navigation"""
+from math import asin, cos, radians, sin, sqrt
+from typing import Tuple
+
+EARTH_RADIUS_METERS = 6371000.0
+
+
+def haversine_origin(lat0: float, lon0: float) -> Tuple[float, float, float]:
+    """Precompute (lat0, lon0, cos(lat0)) in radians for repeated haversine_from_origin calls"""
+    lat0, lon0 = radians(lat0), radians(lon0)
+    return lat0, lon0, cos(lat0)
+
+
+def haversine_from_origin(origin: Tuple[float, float, float], lat: float, lon: float) -> float:
+    """Great-circle distance in meters from a prepared origin to one point"""
+    lat0, lon0, cos_lat0 = origin
+    lat = radians(lat)
+    a = sin((lat - lat0) / 2) ** 2 + cos_lat0 * cos(lat) * sin((radians(lon) - lon0) / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * asin(sqrt(a))
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""Test that buffered commands have their intents and answers generated concurrently"""
+
+import asyncio
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import app
+
+
+class FakeLLM:
+    """Records batched calls; questions start with 'why', everything else describes the scene"""
+
+    def __init__(self):
+        self.intent_batches = []
+        self.response_batches = []
+
+    async def understand_intents(self, commands, context=None):
+        self.intent_batches.append(list(commands))
+        return [
+            {'action': 'general_questions' if command.startswith('why') else 'describe_scene', 'parameters': {}}
+            for command in commands
+        ]
+
+    async def generate_responses(self, queries, context=None):
+        self.response_batches.append(list(queries))
+        return [f"answer to {query}" for query in queries]
+
+    async def generate_response_stream(self, query, context=None):
+        yield f"streamed answer to {query}"
+
+
+class FakeSpeech:
+    def __init__(self):
+        self.spoken = []
+
+    def speak(self, text, use_google=None):
+        self.spoken.append(text)
+
+    async def speak_stream(self, chunks, use_google=None):
+        async for chunk in chunks:
+            self.spoken.append(chunk)
+
+
+class FakeDB:
+    def __init__(self):
+        self.recorded = []
+        self.hits = []
+
+    def record_intent(self, key, intent):
+        self.recorded.append(key)
+
+    def record_intent_hit(self, key):
+        self.hits.append(key)
+
+
+def _make_assistant():
+    # Skip __init__: no camera, microphone or models are needed to drive dispatch
+    assistant = app.VisionAssistant.__new__(app.VisionAssistant)
+    assistant.llm = FakeLLM()
+    assistant.speech = FakeSpeech()
+    assistant.db = FakeDB()
+    assistant.user_context = {}
+    assistant._intent_cache = OrderedDict()
+    assistant._prewarm_done = threading.Event()
+    assistant._prewarm_done.set()
+    assistant.scenes = []
+
+    async def describe_environment(detailed=False):
+        assistant.scenes.append(detailed)
+    assistant.describe_environment = describe_environment
+    assistant._intent_handlers = assistant._build_intent_handlers()
+    return assistant
+
+
+def test_buffered_commands_parse_in_one_batch():
+    """Uncached commands go to understand_intents together and run in the order spoken"""
+    assistant = _make_assistant()
+    assistant._intent_cache["describe"] = {'action': 'describe_scene', 'parameters': {}}
+
+    asyncio.run(assistant.process_commands(["why is it dark", "describe", "why so loud", "look around"]))
+
+    assert assistant.llm.intent_batches == [["why is it dark", "why so loud", "look around"]]
+    assert assistant.llm.response_batches == [["why is it dark", "why so loud"]]
+    answers = [text for text in assistant.speech.spoken if text.startswith("answer to")]
+    assert answers == ["answer to why is it dark", "answer to why so loud"]
+    assert assistant.scenes == [True, True]
+    # Parsed intents are cached without the pre-generated answers
+    assert 'answer' not in assistant._intent_cache["why is it dark"]
+    assert assistant.db.recorded == ["why is it dark", "why so loud", "look around"]
+    assert assistant.db.hits == ["describe"]
+    print("✓ Buffered commands parsed and answered concurrently")
+
+
+def test_keyword_commands_skip_intent_parsing():
+    """Phrase-matched commands are handled directly and never sent to the LLM"""
+    assistant = _make_assistant()
+    handled = []
+
+    async def handle_audio(command):
+        handled.append(command)
+    assistant._handle_audio_assistance = handle_audio
+
+    asyncio.run(assistant.process_commands(["what do you hear", "why is the sky blue"]))
+
+    assert handled == ["what do you hear"]
+    assert assistant.llm.intent_batches == [["why is the sky blue"]]
+    # A single question streams its answer instead of waiting for the whole reply
+    assert assistant.llm.response_batches == []
+    assert "streamed answer to why is the sky blue" in assistant.speech.spoken
+    print("✓ Keyword commands bypass intent parsing")
+
+
+if __name__ == "__main__":
+    test_buffered_commands_parse_in_one_batch()
+    test_keyword_commands_skip_intent_parsing()
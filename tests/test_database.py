@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""Test the database write-behind writer, intent cache upserts and time-range queries"""
+
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+try:
+    from database import db_handler
+    from database.db_handler import DatabaseHandler, WRITE_BATCH_SIZE
+    from database.models import ConversationHistory, IntentCache
+except ImportError as e:
+    pytest.skip(f"Database dependencies not installed: {e}", allow_module_level=True)
+
+
+def test_close_flushes_queued_rows():
+    """Rows still queued when close() is called are all committed, across several batches"""
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = Path(workdir) / "test.db"
+        db = DatabaseHandler(db_path=str(db_path))
+        count = WRITE_BATCH_SIZE * 2 + 50
+        for i in range(count):
+            db.save_conversation(1, f"question {i}", f"answer {i}")
+        db.close()
+
+        db = DatabaseHandler(db_path=str(db_path))
+        try:
+            with db.Session() as session:
+                assert session.query(ConversationHistory).count() == count
+            history = db.get_conversation_history(1, limit=1)
+            assert history[0]['timestamp'] is not None
+        finally:
+            db.close()
+    print(f"✓ close() flushed all {count} queued rows")
+
+
+@pytest.mark.parametrize("on_conflict", [True, False], ids=["on-conflict", "select-then-update"])
+def test_intent_upsert_overwrites(on_conflict):
+    """Storing a key again replaces its intent and counts the hit; invalid intents are dropped"""
+    # Without an ON CONFLICT construct the handler falls back to select-then-update
+    with tempfile.TemporaryDirectory() as workdir, \
+            mock.patch.dict(db_handler._UPSERT_INSERTS, clear=not on_conflict):
+        db_path = Path(workdir) / "test.db"
+        db = DatabaseHandler(db_path=str(db_path))
+        db.record_intent("go home", {'action': 'navigate', 'parameters': {}})
+        db.record_intent("hello", {'action': 'general_questions', 'parameters': {}, 'fallback': True})
+        db.close()
+
+        db = DatabaseHandler(db_path=str(db_path))
+        db.record_intent("go home", {'action': 'navigate', 'parameters': {'destination': 'home'}})
+        db.close()
+
+        db = DatabaseHandler(db_path=str(db_path))
+        try:
+            assert db.load_intent_cache() == [
+                ("go home", {'action': 'navigate', 'parameters': {'destination': 'home'}})
+            ]
+            with db.Session() as session:
+                assert session.get(IntentCache, "go home").hits == 2
+        finally:
+            db.close()
+    print("✓ Intent upsert overwrote the stored intent and bumped hits")
+
+
+def test_cache_hits_update_ranking():
+    """Hits served from memory are counted, so they change which intents load first"""
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = Path(workdir) / "test.db"
+        db = DatabaseHandler(db_path=str(db_path))
+        db.record_intent("go home", {'action': 'navigate', 'parameters': {}})
+        db.record_intent("read this", {'action': 'read_text', 'parameters': {}})
+        db.close()
+
+        db = DatabaseHandler(db_path=str(db_path))
+        for _ in range(3):
+            db.record_intent_hit("read this")
+        db.record_intent_hit("never stored")
+        db.close()
+
+        db = DatabaseHandler(db_path=str(db_path))
+        try:
+            assert [key for key, _ in db.load_intent_cache()] == ["read this", "go home"]
+            with db.Session() as session:
+                assert session.get(IntentCache, "read this").hits == 4
+                assert session.get(IntentCache, "never stored") is None
+        finally:
+            db.close()
+    print("✓ In-memory cache hits were written back and reordered the cache")
+
+
+def test_legacy_database_moves_to_configured_url():
+    """Data written to DEFAULT_DB_PATH by earlier releases follows DATABASE_URL"""
+    with tempfile.TemporaryDirectory() as workdir:
+        legacy = Path(workdir) / "vision_assistant.db"
+        target = Path(workdir) / "database" / "vision_assistant.db"
+        db = DatabaseHandler(db_path=str(legacy))
+        db.save_conversation(1, "question", "answer")
+        db.close()
+
+        with mock.patch.object(db_handler, 'DEFAULT_DB_PATH', str(legacy)), \
+                mock.patch.dict(os.environ, {'DATABASE_URL': f"sqlite:///{target}"}):
+            db = DatabaseHandler()
+        try:
+            assert not legacy.exists() and target.exists()
+            assert db.get_conversation_history(1)[0]['user_input'] == "question"
+        finally:
+            db.close()
+    print("✓ Legacy database moved to the DATABASE_URL path")
+
+
+def test_time_range_bounds():
+    """between() includes its start and excludes its end; date_range() covers exactly one day"""
+    day = date(2024, 3, 10)
+    start = datetime(2024, 3, 10)
+    stamps = {
+        'day before': start - timedelta(microseconds=1),
+        'midnight': start,
+        'last instant': start + timedelta(days=1, microseconds=-1),
+        'next midnight': start + timedelta(days=1),
+    }
+
+    db = DatabaseHandler(database_url="sqlite://")
+    try:
+        with db.Session() as session:
+            session.add_all(
+                ConversationHistory(user_id="1", user_message=name, timestamp=stamp)
+                for name, stamp in stamps.items()
+            )
+            session.add(ConversationHistory(user_id="2", user_message="other user", timestamp=start))
+            session.commit()
+
+            def names(query):
+                return sorted(row.user_message for row in query)
+
+            assert names(ConversationHistory.date_range(session, "1", day)) == ['last instant', 'midnight']
+            assert names(ConversationHistory.between(session, "1", stamps['day before'], start)) == ['day before']
+            assert names(ConversationHistory.between(session, "1", start, start)) == []
+    finally:
+        db.close()
+    print("✓ Time ranges are inclusive at the start and exclusive at the end")
+
+
+if __name__ == "__main__":
+    test_close_flushes_queued_rows()
+    test_intent_upsert_overwrites(True)
+    test_intent_upsert_overwrites(False)
+    test_cache_hits_update_ranking()
+    test_legacy_database_moves_to_configured_url()
+    test_time_range_bounds()
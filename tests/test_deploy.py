@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""Test that deploy.py runs each setup phase exactly once"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def test_setup_environment_runs_each_phase_once():
+    """setup_environment must not repeat venv/pip/model steps per directory"""
+    print("=" * 70)
+    print("Testing deploy.py setup phases")
+    print("=" * 70)
+
+    import deploy
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            with mock.patch.object(deploy.subprocess, "check_call") as check_call, \
+                    mock.patch.object(deploy, "urlretrieve") as urlretrieve:
+                deploy.setup_environment()
+        finally:
+            os.chdir(cwd)
+
+        commands = [call.args[0] for call in check_call.call_args_list]
+        phases = {
+            'create venv': [c for c in commands if c[1:3] == ['-m', 'venv']],
+            'upgrade pip': [c for c in commands if 'setuptools' in c],
+            'install requirements': [c for c in commands if 'requirements.txt' in c],
+            'check models': [c for c in commands if '-c' in c],
+        }
+
+        for phase, calls in phases.items():
+            print(f"  {phase:.<30} {len(calls)} call(s)")
+            assert len(calls) == 1, f"{phase} ran {len(calls)} times"
+        assert len(commands) == len(phases), f"Unexpected subprocess calls: {commands}"
+        urlretrieve.assert_called_once()
+        assert urlretrieve.call_args.args[0] == deploy.FACE_MODEL_URL
+
+        # Config files are written once, without the function's indentation
+        env_lines = (Path(workdir) / '.env').read_text().splitlines()
+        assert not any(line.startswith(' ') for line in env_lines), ".env has indented lines"
+
+    print("\n✓ Deploy setup test passed!\n")
+
+
+if __name__ == "__main__":
+    test_setup_environment_runs_each_phase_once()
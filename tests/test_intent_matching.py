@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""Test local intent matching: the Aho-Corasick automaton and the plain scan pick the same intent"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+try:
+    from ai_modules.llm_handler import LLMHandler
+except ImportError as e:
+    pytest.skip(f"AI module dependencies not installed: {e}", allow_module_level=True)
+
+
+# Commands whose keywords overlap across intents, with the intent declared first winning
+EXPECTED_INTENTS = {
+    "What do you see?": 'describe_scene',       # 'what' is also a general question
+    "Read what it says": 'read_text',           # 'read' before 'what'
+    "STOP reading please": 'read_text',         # 'read' (read_text) before 'stop' (exit)
+    "help me navigate home": 'navigate',        # navigate is declared before emergency
+    "identify person over there": 'recognize_objects',  # 'identify' before 'identify person'
+    "who is this": 'recognize_people',
+    "call for help, danger": 'emergency',
+    "close the door": 'exit',
+    "why is the sky blue": 'general_questions',
+    "hello there": 'general_questions',         # no keyword at all
+}
+
+
+def _scan_only(handler: LLMHandler) -> LLMHandler:
+    handler._automaton = None
+    return handler
+
+
+def test_scan_matches_expected_priority():
+    """The plain substring scan picks the first declared intent with a matching keyword"""
+    handler = _scan_only(LLMHandler(use_openai=False))
+    for command, intent in EXPECTED_INTENTS.items():
+        assert handler._match_intent(command) == intent, command
+    print("✓ Substring scan follows intent declaration order")
+
+
+def test_automaton_matches_scan():
+    """Aho-Corasick and the scan fallback agree on every command"""
+    handler = LLMHandler(use_openai=False)
+    if handler._automaton is None:
+        pytest.skip("pyahocorasick not installed")
+    scan = _scan_only(LLMHandler(use_openai=False))
+
+    commands = list(EXPECTED_INTENTS) + [
+        f"{keyword} and {other}"
+        for keywords in handler.intents.values() for keyword in keywords
+        for other in ('bye', 'text', 'what')
+    ]
+    for command in commands:
+        assert handler._match_intent(command) == scan._match_intent(command), command
+    print(f"✓ Automaton and scan agree on {len(commands)} commands")
+
+
+def test_parse_intent_validates_shape():
+    """Only JSON objects naming a known action parse; bad parameters become {}"""
+    handler = LLMHandler(use_openai=False)
+    assert handler._parse_intent('{"action": "navigate", "parameters": {"destination": "park"}}') == \
+        {'action': 'navigate', 'parameters': {'destination': 'park'}}
+    assert handler._parse_intent('{"action": "read_text", "parameters": "none"}') == \
+        {'action': 'read_text', 'parameters': {}}
+    assert handler._parse_intent('{"action": "fly"}') is None
+    assert handler._parse_intent('["navigate"]') is None
+    assert handler._parse_intent('not json') is None
+    print("✓ Intent JSON is validated")
+
+
+def test_understand_intents_keeps_order():
+    """Batched intents come back in the order the commands were given"""
+    handler = LLMHandler(use_openai=False)
+    commands = ["close the door", "read the sign", "who is this"]
+    intents = asyncio.run(handler.understand_intents(commands))
+    assert [intent['action'] for intent in intents] == ['exit', 'read_text', 'recognize_people']
+    assert [intent['parameters']['query'] for intent in intents] == commands
+    print("✓ understand_intents preserves command order")
+
+
+if __name__ == "__main__":
+    test_scan_matches_expected_priority()
+    test_automaton_matches_scan()
+    test_parse_intent_validates_shape()
+    test_understand_intents_keeps_order()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""Test the semantic cache: threshold hits and misses, ring-buffer eviction and persistence"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+try:
+    from ai_modules.semantic_cache import SemanticCache
+except ImportError as e:
+    pytest.skip(f"AI module dependencies not installed: {e}", allow_module_level=True)
+
+
+def _basis(i: int, dim: int = 16) -> np.ndarray:
+    """Orthogonal unit embeddings, so distinct entries never match each other"""
+    vector = np.zeros(dim, dtype=np.float32)
+    vector[i] = 1.0
+    return vector
+
+
+def _cache(cache_dir, **kwargs) -> SemanticCache:
+    return SemanticCache("test-model", cache_dir=cache_dir, **kwargs)
+
+
+def test_threshold_hit_and_miss():
+    """A query above the threshold hits, one below it misses, and namespaces don't mix"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = _cache(cache_dir, threshold=0.9)
+        cache.insert('intent', _basis(0), {'action': 'describe_scene', 'parameters': {}})
+
+        # cosine with _basis(0) is exactly the first component of a unit vector
+        close = np.array([0.95, np.sqrt(1 - 0.95 ** 2)] + [0.0] * 14, dtype=np.float32)
+        far = np.array([0.85, np.sqrt(1 - 0.85 ** 2)] + [0.0] * 14, dtype=np.float32)
+
+        assert cache.lookup('intent', close) == {'action': 'describe_scene', 'parameters': {}}
+        assert cache.lookup('intent', far) is None
+        assert cache.lookup('response', _basis(0)) is None
+        assert cache.lookup('intent', _basis(1)) is None
+    print("✓ Threshold decides hits; namespaces are kept apart")
+
+
+def test_ring_buffer_evicts_oldest():
+    """Past max_entries each insert overwrites the oldest row"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = _cache(cache_dir, max_entries=4)
+        for i in range(6):
+            cache.insert('response', _basis(i), f"answer {i}")
+
+        assert cache._size == 4
+        assert [cache.lookup('response', _basis(i)) for i in range(6)] == \
+            [None, None, "answer 2", "answer 3", "answer 4", "answer 5"]
+        assert [cache.values[i][1] for i in cache._ordered_rows()] == \
+            ["answer 2", "answer 3", "answer 4", "answer 5"]
+    print("✓ Ring buffer wraps around and evicts the oldest entries")
+
+
+def test_save_and_reload_preserve_order():
+    """A reloaded cache has the same entries and keeps evicting oldest first"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = _cache(cache_dir, max_entries=4)
+        for i in range(6):
+            cache.insert('response', _basis(i), f"answer {i}")
+        cache.save()
+
+        reloaded = _cache(cache_dir, max_entries=4)
+        assert reloaded.lookup('response', _basis(5)) == "answer 5"
+        assert reloaded.lookup('response', _basis(1)) is None
+
+        reloaded.insert('response', _basis(6), "answer 6")
+        assert reloaded.lookup('response', _basis(2)) is None
+        assert reloaded.lookup('response', _basis(3)) == "answer 3"
+    print("✓ Saved cache reloads in eviction order")
+
+
+if __name__ == "__main__":
+    test_threshold_hit_and_miss()
+    test_ring_buffer_evicts_oldest()
+    test_save_and_reload_preserve_order()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""Test the similarity kernels: Numba and NumPy paths agree, int8 search tracks float search"""
+
+import importlib.util
+import sys
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import similarity
+
+
+def _load_numpy_fallback():
+    """A separate copy of utils.similarity imported as if numba were missing"""
+    spec = importlib.util.spec_from_file_location(
+        "utils._similarity_numpy", Path(similarity.__file__)
+    )
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch.dict(sys.modules, {'numba': None}):
+        spec.loader.exec_module(module)
+    assert not module.HAS_NUMBA
+    return module
+
+
+def _unit_rows(n: int, dim: int, seed: int = 0) -> np.ndarray:
+    rows = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def test_numba_and_numpy_paths_agree():
+    """Both kernel sets return the same neighbours and scores"""
+    fallback = _load_numpy_fallback()
+    matrix = _unit_rows(200, 64)
+    query = matrix[17] + 0.01 * _unit_rows(1, 64, seed=1)[0]
+    query /= np.linalg.norm(query)
+
+    for module in (similarity, fallback):
+        indices, _ = module.topk_cosine(matrix, query, k=5)
+        assert indices[0] == 17
+
+    fast, slow = similarity.topk_cosine(matrix, query, k=5), fallback.topk_cosine(matrix, query, k=5)
+    np.testing.assert_array_equal(fast[0], slow[0])
+    np.testing.assert_allclose(fast[1], slow[1], rtol=1e-5)
+
+    quantized, scales = similarity.quantize_int8(matrix)
+    fast = similarity.topk_cosine_int8(quantized, scales, query, k=5)
+    slow = fallback.topk_cosine_int8(quantized, scales, query, k=5)
+    np.testing.assert_array_equal(fast[0], slow[0])
+    np.testing.assert_allclose(fast[1], slow[1], rtol=1e-6)
+
+    fast, slow = similarity.nearest_l2(matrix, query), fallback.nearest_l2(matrix, query)
+    assert fast[0] == slow[0] == 17
+    assert abs(fast[1] - slow[1]) < 1e-5
+    print(f"✓ Numba ({similarity.HAS_NUMBA}) and NumPy kernels agree")
+
+
+def test_quantize_int8_round_trip():
+    """Values fit int8, the largest magnitude maps to ±127 and dequantizing stays close"""
+    vectors = _unit_rows(10, 32)
+    vectors[3] = 0.0  # an all-zero row must not divide by zero
+    quantized, scales = similarity.quantize_int8(vectors)
+
+    assert quantized.dtype == np.int8 and scales.shape == (10,)
+    assert np.abs(quantized[np.arange(10) != 3]).max(axis=1).tolist() == [127] * 9
+    assert not quantized[3].any() and scales[3] == 1.0
+    np.testing.assert_allclose(quantized * scales[:, np.newaxis], vectors, atol=scales.max() / 2 + 1e-7)
+
+    single, scale = similarity.quantize_int8(vectors[0])
+    np.testing.assert_array_equal(single, quantized[0])
+    assert scale == scales[0]
+    print("✓ int8 quantization round-trips within half a step")
+
+
+def test_int8_search_matches_float_search():
+    """Quantized scores stay within a small error of float cosine and keep the best match"""
+    matrix = _unit_rows(500, 128, seed=2)
+    query = _unit_rows(1, 128, seed=3)[0]
+    quantized, scales = similarity.quantize_int8(matrix)
+
+    float_indices, float_scores = similarity.topk_cosine(matrix, query, k=500)
+    int8_indices, int8_scores = similarity.topk_cosine_int8(quantized, scales, query, k=500)
+
+    exact = dict(zip(float_indices.tolist(), float_scores.tolist()))
+    assert max(abs(exact[i] - s) for i, s in zip(int8_indices.tolist(), int8_scores.tolist())) < 0.02
+    assert int8_indices[0] == float_indices[0]
+    print("✓ int8 cosine search tracks float search")
+
+
+def test_top_k_edge_cases():
+    """k larger than the row count is clamped, and results come best first"""
+    matrix = _unit_rows(3, 8)
+    indices, scores = similarity.topk_cosine(matrix, matrix[1], k=10)
+    assert len(indices) == 3 and indices[0] == 1
+    assert list(scores) == sorted(scores, reverse=True)
+    print("✓ top-k clamps k and sorts best first")
+
+
+if __name__ == "__main__":
+    test_numba_and_numpy_paths_agree()
+    test_quantize_int8_round_trip()
+    test_int8_search_matches_float_search()
+    test_top_k_edge_cases()
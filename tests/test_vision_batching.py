@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""Test that concurrent detect requests are batched through the YOLO worker"""
+
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+try:
+    from ai_modules.vision_processor import VisionProcessor, MAX_BATCH_SIZE
+except ImportError as e:
+    pytest.skip(f"Vision dependencies not installed: {e}", allow_module_level=True)
+
+
+class FakeModel:
+    """Stands in for YOLO: one result per frame, optionally rejecting batches"""
+
+    def __init__(self, max_batch: int):
+        self.max_batch = max_batch
+        self.calls = []
+
+    def __call__(self, frames, **kwargs):
+        self.calls.append(len(frames))
+        if len(frames) > self.max_batch:
+            raise RuntimeError(f"engine built for batch {self.max_batch}, got {len(frames)}")
+        return [f"result-{int(frame[0, 0, 0])}" for frame in frames]
+
+
+def _make_processor(model) -> VisionProcessor:
+    # Skip __init__: no camera, weights or OCR reader are needed to drive the worker
+    vp = VisionProcessor.__new__(VisionProcessor)
+    vp.object_model = model
+    vp.device = 'cpu'
+    vp.half = False
+    vp._executor = ThreadPoolExecutor(max_workers=1)
+    vp._pending_frames = None
+    vp._batch_worker = None
+    vp._max_batch_size = MAX_BATCH_SIZE
+    return vp
+
+
+async def _infer_concurrently(vp, count: int):
+    frames = [np.full((8, 8, 3), i, dtype=np.uint8) for i in range(count)]
+    try:
+        return await asyncio.gather(*(vp._infer_objects(frame) for frame in frames))
+    finally:
+        vp._batch_worker.cancel()
+
+
+def test_concurrent_requests_share_one_batch():
+    """Several concurrent frames go through one model call and each gets its own result"""
+    model = FakeModel(max_batch=MAX_BATCH_SIZE)
+    results = asyncio.run(_infer_concurrently(_make_processor(model), 4))
+
+    assert model.calls == [4]
+    assert results == [[f"result-{i}"] for i in range(4)]
+    print("✓ 4 concurrent requests served by one batched call")
+
+
+def test_batch_rejected_by_model_falls_back_to_single_frames():
+    """A model that only takes batch 1 still answers every request"""
+    model = FakeModel(max_batch=1)
+    vp = _make_processor(model)
+    results = asyncio.run(_infer_concurrently(vp, 3))
+
+    assert results == [[f"result-{i}"] for i in range(3)]
+    assert vp._max_batch_size == 1
+    assert model.calls[0] == 3 and all(size == 1 for size in model.calls[1:])
+    print("✓ Rejected batch retried one frame per call")
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_one_batch()
+    test_batch_rejected_by_model_falls_back_to_single_frames()
@@ -1 +1,11 @@
 """Utils module"""
+from .compile_cache import configure_compile_caches
+from .similarity import topk_cosine, topk_cosine_int8, quantize_int8, nearest_l2
+
+__all__ = [
+    "configure_compile_caches",
+    "topk_cosine",
+    "topk_cosine_int8",
+    "quantize_int8",
+    "nearest_l2",
+]
@@ -0,0 +1,20 @@
+"""Compile Cache - Persist JIT/compiled artifacts across runs"""
+import os
+from pathlib import Path
+
+# Shared cache root; override with AIFORUS_CACHE_DIR
+CACHE_ROOT = Path(os.getenv("AIFORUS_CACHE_DIR", Path.home() / ".cache" / "aiforus"))
+
+
+def configure_compile_caches() -> None:
+    """
+    Point Numba, TorchInductor and Ultralytics at persistent locations
+
+    Must run before numba/torch/ultralytics are imported so their
+    settings pick up the environment. Existing values are kept.
+    """
+    os.environ.setdefault("NUMBA_CACHE_DIR", str(CACHE_ROOT / "numba"))
+    os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", str(CACHE_ROOT / "inductor"))
+    os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
+    # Never pip-install missing export backends at runtime
+    os.environ.setdefault("YOLO_AUTOINSTALL", "False")
@@ -0,0 +1,144 @@
+"""Similarity Search - Nearest-neighbour kernels for embedding lookups"""
+import logging
+from typing import Tuple
+
+import numpy as np
+
+from .compile_cache import configure_compile_caches
+
+logger = logging.getLogger(__name__)
+
+# Numba reads NUMBA_CACHE_DIR at import time
+configure_compile_caches()
+
+# Try to import numba, fallback to NumPy
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    logger.debug("numba not installed, using NumPy similarity search. Install with: pip install numba")
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _dot_rows(matrix, query):
+        scores = np.empty(matrix.shape[0], dtype=np.float32)
+        for i in prange(matrix.shape[0]):
+            acc = np.float32(0.0)
+            for j in range(matrix.shape[1]):
+                acc += matrix[i, j] * query[j]
+            scores[i] = acc
+        return scores
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _l2_rows(matrix, query):
+        distances = np.empty(matrix.shape[0], dtype=np.float32)
+        for i in prange(matrix.shape[0]):
+            acc = np.float32(0.0)
+            for j in range(matrix.shape[1]):
+                diff = matrix[i, j] - query[j]
+                acc += diff * diff
+            distances[i] = np.sqrt(acc)
+        return distances
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _dot_rows_int8(matrix, query):
+        scores = np.empty(matrix.shape[0], dtype=np.int32)
+        for i in prange(matrix.shape[0]):
+            acc = np.int32(0)
+            for j in range(matrix.shape[1]):
+                acc += np.int32(matrix[i, j]) * np.int32(query[j])
+            scores[i] = acc
+        return scores
+else:
+    def _dot_rows_int8(matrix, query):
+        return matrix.astype(np.int32) @ query.astype(np.int32)
+
+    def _dot_rows(matrix, query):
+        return matrix @ query
+
+    def _l2_rows(matrix, query):
+        return np.linalg.norm(matrix - query, axis=1)
+
+
+def _top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices and values of the k largest scores, best first"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    top = np.argpartition(scores, -k)[-k:]
+    top = top[np.argsort(scores[top])[::-1]]
+    return top, scores[top]
+
+
+def topk_cosine(matrix: np.ndarray, query: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the rows most similar to a query
+
+    Args:
+        matrix: (n, dim) float32 array of L2-normalized rows
+        query: (dim,) L2-normalized query vector
+        k: Number of results
+
+    Returns:
+        (indices, scores) of the top k rows, best first
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    query = np.ascontiguousarray(query, dtype=np.float32)
+    scores = _dot_rows(matrix, query)
+    return _top_k(scores, k)
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-row int8 quantization
+
+    Args:
+        vectors: (n, dim) or (dim,) float array
+
+    Returns:
+        (int8 values, float32 scale per row); values * scale approximates the input
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=-1, keepdims=True) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.round(vectors / scales).astype(np.int8)
+    return quantized, scales.squeeze(-1)
+
+
+def topk_cosine_int8(matrix: np.ndarray, scales: np.ndarray, query: np.ndarray,
+                     k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    topk_cosine over rows stored as quantize_int8 output
+
+    Args:
+        matrix: (n, dim) int8 rows of L2-normalized vectors
+        scales: (n,) per-row scales from quantize_int8
+        query: (dim,) L2-normalized float query vector
+        k: Number of results
+
+    Returns:
+        (indices, approximate scores) of the top k rows, best first
+    """
+    query, query_scale = quantize_int8(query)
+    scores = _dot_rows_int8(np.ascontiguousarray(matrix), query) * (scales * query_scale)
+    return _top_k(scores.astype(np.float32), k)
+
+
+def nearest_l2(matrix: np.ndarray, query: np.ndarray) -> Tuple[int, float]:
+    """
+    Find the row closest to a query by Euclidean distance
+
+    Args:
+        matrix: (n, dim) array of vectors, n > 0
+        query: (dim,) query vector
+
+    Returns:
+        (index, distance) of the closest row
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    query = np.ascontiguousarray(query, dtype=np.float32)
+    distances = _l2_rows(matrix, query)
+    index = int(np.argmin(distances))
+    return index, float(distances[index])